@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Synthetic Zero Sievert game data generator.
+
+Produces an input folder of vanilla-like JSON5 files (a "data" map of IDs,
+"items" arrays of {"item": ...} objects, nested stats, trailing commas and
+unicode names) plus a matching change folder that looks like a mod delta.
+
+Usage:
+    python generate_data.py <target_folder> [--size-mb 1.0] [--files 8] [--seed 1]
+
+<target_folder>/input and <target_folder>/change are (re)created.
+"""
+import argparse
+import copy
+import os
+import random
+import shutil
+
+import json5 as json
+
+CATEGORIES = ["weapon", "ammo", "armor", "med", "food", "loot", "backpack", "w_mod"]
+CALIBERS = ["545x39", "762x39", "9x19", "12g", "556x45", "762x54"]
+FACTIONS = ["bandits", "green_army", "crimson", "loners", "scientists"]
+NAME_PARTS = ["Волк", "Ржавый", "Sievert", "Zöne", "Кедр", "Błoto", "Ash", "Ключ", "Échelon", "Tundra"]
+
+
+def make_id(rng, category, index):
+    return f"{category}_{index}_{rng.randrange(16 ** 4):04x}"
+
+
+def make_name(rng):
+    return " ".join(rng.choice(NAME_PARTS) for _ in range(rng.randint(1, 3)))
+
+
+def make_entry(rng, item_pool):
+    """One ID under "data": scalar fields, nested stats and an items array."""
+    entry = {
+        "name": make_name(rng),
+        "faction": rng.choice(FACTIONS),
+        "price": rng.randint(5, 50000),
+        "weight": round(rng.uniform(0.05, 12.0), 2),
+        "stack_max": rng.choice([1, 1, 5, 10, 30, 60]),
+        "caliber": [rng.choice(CALIBERS) for _ in range(rng.randint(0, 3))],
+        "stats": {
+            "damage": rng.randint(1, 120),
+            "durability": {"max": 100, "loss": round(rng.uniform(0.01, 0.5), 3)},
+            "recoil": [round(rng.uniform(0.1, 3.0), 2) for _ in range(4)],
+        },
+    }
+    if item_pool:
+        entry["items"] = [
+            {
+                "item": rng.choice(item_pool),
+                "weight": rng.randint(1, 100),
+                "min": 1,
+                "max": rng.randint(1, 5),
+            }
+            for _ in range(rng.randint(1, 8))
+        ]
+    return entry
+
+
+def make_delta(rng, vanilla, category, new_count):
+    """Mod-style delta: copied entries with one field changed, new IDDs and new IDs."""
+    data = vanilla["data"]
+    ids = list(data.keys())
+    delta = {}
+    for id_key in rng.sample(ids, max(1, len(ids) // 4)):
+        entry = copy.deepcopy(data[id_key])
+        entry["price"] = int(entry["price"] * rng.uniform(0.5, 2.0))
+        if "items" in entry and rng.random() < 0.5:
+            entry["items"].append({"item": rng.choice(ids), "weight": 5, "min": 1, "max": 1})
+        delta[id_key] = entry
+    for index in range(new_count):
+        delta[make_id(rng, category + "_mod", index)] = make_entry(rng, ids)
+    return {"data": delta}
+
+
+def dumps(data):
+    return json.dumps(data, indent=4, ensure_ascii=False, quote_keys=True, trailing_commas=True) + "\n"
+
+
+def generate(target_folder, size_mb=1.0, files=8, seed=1):
+    """
+    Create <target_folder>/input and <target_folder>/change totalling roughly
+    size_mb megabytes of input JSON spread over `files` files.
+    Returns the total number of input bytes written.
+    """
+    rng = random.Random(seed)
+    input_folder = os.path.join(target_folder, "input")
+    change_folder = os.path.join(target_folder, "change")
+    for folder in (input_folder, change_folder):
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+
+    per_file_bytes = int(size_mb * 1024 * 1024 / files)
+    total_bytes = 0
+    for file_index in range(files):
+        category = CATEGORIES[file_index % len(CATEGORIES)]
+        filename = f"{category}.json" if file_index < len(CATEGORIES) else f"{category}_{file_index}.json"
+
+        # Grow the file until it reaches its share of the target size. Entries
+        # are indented two levels deeper in the final file, hence the estimate.
+        data = {}
+        pool = []
+        estimated_bytes = 0
+        while estimated_bytes < per_file_bytes:
+            id_key = make_id(rng, category, len(data))
+            entry = make_entry(rng, pool)
+            data[id_key] = entry
+            pool.append(id_key)
+            entry_text = dumps(entry)
+            estimated_bytes += len(entry_text.encode("utf-8")) + 8 * entry_text.count("\n") + len(id_key)
+        vanilla = {"data": data}
+        text = dumps(vanilla)
+
+        with open(os.path.join(input_folder, filename), "w", encoding="utf-8") as f:
+            f.write(text)
+        total_bytes += len(text.encode("utf-8"))
+
+        delta = make_delta(rng, vanilla, category, new_count=max(1, len(data) // 20))
+        with open(os.path.join(change_folder, filename), "w", encoding="utf-8") as f:
+            f.write(dumps(delta))
+
+    return total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Zero Sievert JSON5 data.")
+    parser.add_argument("target_folder")
+    parser.add_argument("--size-mb", type=float, default=1.0, help="approximate total size of the input folder")
+    parser.add_argument("--files", type=int, default=8, help="number of JSON files to spread the data over")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    total_bytes = generate(args.target_folder, args.size_mb, args.files, args.seed)
+    print(f"Generated {total_bytes / (1024 * 1024):.2f} MB of input data in '{args.target_folder}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the concurrent I/O pipeline (async_pipeline).
+
+Creates many small files and times fix_trailing_comma.process_json_files and
+texture_renamer.rename_textures sequentially (concurrency 1) and with the
+pipeline, checking that both give the same result. The gain depends mostly
+on storage latency: point --folder at a network share or USB drive to see
+the effect there, a local SSD / tmpfs shows the least. --latency-ms adds a
+sleep to every open / rename / replace to imitate such storage.
+
+Usage:
+    python io_pipeline.py [--files 10000] [--concurrency 16] [--folder path] [--latency-ms 0]
+"""
+import argparse
+import builtins
+import filecmp
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "scripts"))
+
+import fix_trailing_comma  # noqa: E402
+import texture_renamer  # noqa: E402
+from instrumentation import Metrics  # noqa: E402
+
+TOKENS = ["fcount", "xorg", "yorg", "bbox"]
+
+
+def make_json_files(folder, count, seed=1):
+    """Small JSON5 files with trailing commas spread over a few subfolders."""
+    rng = random.Random(seed)
+    for index in range(count):
+        subfolder = os.path.join(folder, f"part_{index % 10}")
+        os.makedirs(subfolder, exist_ok=True)
+        items = ",\n".join(f'        {{"item": "id_{rng.randrange(1000)}", "weight": {rng.randint(1, 99)},}}'
+                           for _ in range(rng.randint(1, 6)))
+        text = f'{{\n    "id": "file_{index}",\n    "items": [\n{items},\n    ],\n}}\n'
+        with open(os.path.join(subfolder, f"file_{index}.json"), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def make_textures(folder, count):
+    """Empty .png files, mostly with old-format names."""
+    os.makedirs(folder, exist_ok=True)
+    for index in range(count):
+        if index % 5:
+            name = f"spr_{index}_{TOKENS[index % 4]}{index % 7}_{TOKENS[(index + 1) % 4]}{index % 3}.png"
+        else:
+            name = f"spr_{index}_f{index % 7}.png"
+        open(os.path.join(folder, name), "wb").close()
+
+
+@contextmanager
+def simulated_latency(latency_ms):
+    """Delay every file open / rename / replace by latency_ms, like a slow or remote disk."""
+    if latency_ms <= 0:
+        yield
+        return
+    delay = latency_ms / 1000
+    originals = builtins.open, os.rename, os.replace
+
+    def delayed(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(delay)
+            return func(*args, **kwargs)
+        return wrapper
+
+    builtins.open, os.rename, os.replace = (delayed(func) for func in originals)
+    try:
+        yield
+    finally:
+        builtins.open, os.rename, os.replace = originals
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def folders_match(left, right):
+    comparison = filecmp.dircmp(left, right)
+    pending = [comparison]
+    while pending:
+        current = pending.pop()
+        if current.left_only or current.right_only or current.diff_files:
+            return False
+        _, mismatch, errors = filecmp.cmpfiles(current.left, current.right, current.common_files, shallow=False)
+        if mismatch or errors:
+            return False
+        pending.extend(current.subdirs.values())
+    return True
+
+
+def report(name, count, sequential, pipelined):
+    print(f"{name:<20} {count / sequential:>10.0f} {count / pipelined:>10.0f} {sequential / pipelined:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and pipelined file processing.")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--folder", help="where to create the test files (default: system temp folder)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated storage latency per operation")
+    args = parser.parse_args()
+
+    work_folder = tempfile.mkdtemp(prefix="zs_io_", dir=args.folder)
+    try:
+        metrics = Metrics("io_pipeline")
+        source = os.path.join(work_folder, "json")
+        make_json_files(source, args.files)
+        results = {}
+        for label, concurrency in (("sequential", 1), ("pipeline", args.concurrency)):
+            output = os.path.join(work_folder, f"fixed_{label}")
+            with simulated_latency(args.latency_ms):
+                results[label] = timed(lambda: fix_trailing_comma.process_json_files(
+                    source, output, metrics, concurrency=concurrency))
+        same_json = folders_match(os.path.join(work_folder, "fixed_sequential"),
+                                  os.path.join(work_folder, "fixed_pipeline"))
+
+        renamed = {}
+        for label, concurrency in (("sequential", 1), ("pipeline", args.concurrency)):
+            folder = os.path.join(work_folder, f"textures_{label}")
+            make_textures(folder, args.files)
+            with simulated_latency(args.latency_ms):
+                results[f"rename_{label}"] = timed(lambda: texture_renamer.rename_textures(folder, concurrency, metrics))
+            renamed[label] = sorted(os.listdir(folder))
+
+        print(f"\n{args.files} files, concurrency {args.concurrency}, "
+              f"simulated latency {args.latency_ms:g} ms, in {work_folder}")
+        print(f"{'script':<20} {'seq files/s':>10} {'pipe files/s':>10} {'speedup':>8}")
+        report("fix_trailing_comma", args.files, results["sequential"], results["pipeline"])
+        report("texture_renamer", args.files, results["rename_sequential"], results["rename_pipeline"])
+        print(f"identical results: {same_json and renamed['sequential'] == renamed['pipeline']}")
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: plain json5 dicts vs compact_json.CompactLoader.
+
+Loads every generated input and change file and keeps them all in memory
+(as watch mode's cache does), then reports retained memory, load time and
+whether merging, sorting and field editing give identical results.
+
+Usage:
+    python memory_compact.py [--size-mb 0.5] [--files 8]
+"""
+import argparse
+import copy
+import gc
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "scripts"))
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import generate  # noqa: E402
+from alphabetic_sort import sort_json  # noqa: E402
+from compact_json import CompactLoader  # noqa: E402
+from field_editor import update_field_in_json  # noqa: E402
+from merge_json import load_json, merge_json  # noqa: E402
+from config_loader import ARRAY_MERGE_STRATEGIES  # noqa: E402
+import json5 as json  # noqa: E402
+
+
+def retained_size(obj, seen):
+    """Bytes held by obj and everything reachable from it, counting shared objects once."""
+    size = 0
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        size += sys.getsizeof(node)
+        if isinstance(node, dict):
+            stack.extend(node.keys())
+            stack.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+    return size
+
+
+def load_all(data_folder, load):
+    """Returns ({relative path: parsed}, retained bytes, seconds)."""
+    paths = [os.path.join(data_folder, sub, name)
+             for sub in ("input", "change")
+             for name in sorted(os.listdir(os.path.join(data_folder, sub)))]
+    gc.collect()
+    start = time.perf_counter()
+    documents = {os.path.relpath(path, data_folder): load(path) for path in paths}
+    elapsed = time.perf_counter() - start
+    # Measured by walking the objects: tracemalloc would slow json5 parsing many times over
+    return documents, retained_size(list(documents.values()), set()), elapsed
+
+
+def results_match(plain, compact):
+    """Same merge (every array strategy) / sort / field edit output from both representations."""
+    for rel_path in plain:
+        if not rel_path.startswith("input"):
+            continue
+        delta_path = "change" + rel_path[len("input"):]
+        outputs = []
+        for documents in (plain, compact):
+            merged = [merge_json(copy.deepcopy(documents[rel_path]), copy.deepcopy(documents[delta_path]),
+                                 array_merge_strategy=strategy, new_id_strategy="merge")
+                      for strategy in ARRAY_MERGE_STRATEGIES]
+            edited = update_field_in_json(copy.deepcopy(documents[rel_path]), "price", 1, 2, [])
+            outputs.append((merged, sort_json(documents[rel_path]), edited))
+        # tuples compare unequal to lists, so normalise numeric arrays first
+        if as_lists(outputs[0]) != as_lists(outputs[1]):
+            return False
+    return True
+
+
+# Numeric arrays become tuples in compact mode; these hit the array paths of merge_json with them
+MIXED_ARRAY_CASES = [
+    ('{"a": [1, 2]}', '{"a": ["x"]}'),
+    ('{"a": ["x"]}', '{"a": [1, 2]}'),
+    ('{"a": [1, 2]}', '{"a": [{"item": "q"}]}'),
+    ('{"a": [1.0, -0.0]}', '{"a": [1, 0]}'),
+]
+
+
+def mixed_arrays_match():
+    for parent_text, delta_text in MIXED_ARRAY_CASES:
+        for strategy in ARRAY_MERGE_STRATEGIES:
+            plain = merge_json(json.loads(parent_text), json.loads(delta_text), array_merge_strategy=strategy)
+            loader = CompactLoader()
+            compact = merge_json(loader.loads(parent_text), loader.loads(delta_text), array_merge_strategy=strategy)
+            if json.dumps(plain) != json.dumps(compact):
+                return False
+    return True
+
+
+def as_lists(obj):
+    if isinstance(obj, dict):
+        return {key: as_lists(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [as_lists(value) for value in obj]
+    return obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of plain and compact JSON loading.")
+    parser.add_argument("--size-mb", type=float, default=0.5)
+    parser.add_argument("--files", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="zs_mem_") as data_folder:
+        input_bytes = generate(data_folder, size_mb=args.size_mb, files=args.files)
+        plain, plain_bytes, plain_time = load_all(data_folder, load_json)
+        loader = CompactLoader()
+        compact, compact_bytes, compact_time = load_all(data_folder, lambda path: load_json(path, loader))
+
+        print(f"input: {input_bytes / (1024 * 1024):.2f} MB in {len(plain)} files (input + change)")
+        print(f"{'mode':<10} {'retained MB':>12} {'load s':>8}")
+        print(f"{'plain':<10} {plain_bytes / (1024 * 1024):>12.2f} {plain_time:>8.2f}")
+        print(f"{'compact':<10} {compact_bytes / (1024 * 1024):>12.2f} {compact_time:>8.2f}")
+        print(f"compact uses {100 * (1 - compact_bytes / plain_bytes):.1f}% less memory")
+        print(f"identical merge / sort / edit results: {results_match(plain, compact)}")
+        print(f"identical merges of mixed numeric / string / object arrays: {mixed_arrays_match()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the modding scripts.
+
+Generates synthetic data at several sizes (see generate_data.py), runs each
+script's folder-level function in-process and reports time per MB of input
+and peak Python memory. Results can be saved as a baseline and later runs
+are compared against it to catch regressions.
+
+Usage:
+    python run_benchmarks.py [--sizes 0.1 0.25 0.5] [--repeat 1]
+                             [--scripts merge_json report_new_id ...]
+                             [--save-baseline] [--threshold 15]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import generate  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines.json")
+
+
+def run_merge_json(input_folder, change_folder, output_folder):
+    import merge_json
+    merge_json.process_folders(input_folder, change_folder, output_folder,
+                               array_merge_strategy="merge",
+                               new_id_strategy="merge",
+                               excluded_fields=["faction", "name"])
+
+
+def run_merge_json_skip(input_folder, change_folder, output_folder):
+    import merge_json
+    merge_json.process_folders(input_folder, change_folder, output_folder,
+                               array_merge_strategy="merge",
+                               new_id_strategy="merge",
+                               excluded_fields=["faction", "name"],
+                               skip_identical=True)
+
+
+def run_report_new_id(input_folder, change_folder, output_folder):
+    import report_new_id
+    report_new_id.process_folders(input_folder, change_folder, output_folder)
+
+
+def run_alphabetic_sort(input_folder, change_folder, output_folder):
+    import alphabetic_sort
+    alphabetic_sort.process_folder(input_folder, output_folder)
+
+
+def run_field_editor(input_folder, change_folder, output_folder):
+    import field_editor
+    field_editor.process_folder(input_folder, output_folder, "stack_max", 0, 8)
+
+
+def run_fix_trailing_comma(input_folder, change_folder, output_folder):
+    import fix_trailing_comma
+    fix_trailing_comma.process_json_files(input_folder, output_folder)
+
+
+BENCHMARKS = {
+    "merge_json": run_merge_json,
+    "merge_json_skip": run_merge_json_skip,
+    "report_new_id": run_report_new_id,
+    "alphabetic_sort": run_alphabetic_sort,
+    "field_editor": run_field_editor,
+    "fix_trailing_comma": run_fix_trailing_comma,
+}
+
+
+def run_once(func, data_folder, trace_memory):
+    """Run one benchmark into a fresh output folder; returns (seconds, peak_bytes)."""
+    input_folder = os.path.join(data_folder, "input")
+    change_folder = os.path.join(data_folder, "change")
+    output_folder = tempfile.mkdtemp(prefix="out_", dir=data_folder)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(input_folder, change_folder, output_folder)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_benchmarks(sizes, scripts, repeat):
+    """Returns {"<script>@<size>MB": {"seconds_per_mb": ..., "peak_mb": ...}}."""
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="zs_bench_") as data_folder:
+            input_bytes = generate(data_folder, size_mb=size)
+            input_mb = input_bytes / (1024 * 1024)
+            for name in scripts:
+                func = BENCHMARKS[name]
+                # Timing runs without tracemalloc, which slows allocation-heavy code a lot.
+                best = min(run_once(func, data_folder, trace_memory=False)[0] for _ in range(repeat))
+                _, peak = run_once(func, data_folder, trace_memory=True)
+                results[f"{name}@{size}MB"] = {
+                    "seconds_per_mb": best / input_mb,
+                    "peak_mb": peak / (1024 * 1024),
+                }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table; returns the list of regressed benchmark keys."""
+    regressions = []
+    print(f"{'benchmark':<32} {'s/MB':>9} {'base':>9} {'peak MB':>9} {'base':>9}")
+    for key, result in results.items():
+        base = baseline.get(key)
+        base_time = f"{base['seconds_per_mb']:.3f}" if base else "-"
+        base_peak = f"{base['peak_mb']:.1f}" if base else "-"
+        flag = ""
+        if base:
+            for metric in ("seconds_per_mb", "peak_mb"):
+                if base[metric] and (result[metric] - base[metric]) / base[metric] * 100 > threshold:
+                    flag = "  REGRESSION"
+                    regressions.append(key)
+                    break
+        print(f"{key:<32} {result['seconds_per_mb']:>9.3f} {base_time:>9} "
+              f"{result['peak_mb']:>9.1f} {base_peak:>9}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the modding scripts on synthetic data.")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 0.25, 0.5],
+                        help="input sizes in MB")
+    parser.add_argument("--scripts", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=1, help="timing runs per benchmark, best is kept")
+    parser.add_argument("--save-baseline", action="store_true", help=f"store results in {BASELINE_PATH}")
+    parser.add_argument("--threshold", type=float, default=15.0,
+                        help="percent slowdown or memory growth reported as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.scripts, args.repeat)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold}%.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the zs dispatcher.
+
+Measures process launch time of `zs --list` (dispatcher with no command
+imported) and of `zs <command>` import cost against importing every script
+up front, as each per-script executable does. The first launch is reported
+as cold, the median of the following launches as warm.
+
+With --zs-exe it also times the built executables: `zs.exe --list` and
+`zs.exe <command>` against the per-script executable given with
+--script-exe (default texture_renamer.exe next to the zs folder), both run
+in an empty temporary folder. PyInstaller one-file exes unpack themselves on
+every launch, which the one-folder zs build avoids.
+
+Usage:
+    python startup.py [--runs 10] [--python path/to/python_or_exe]
+                      [--zs-exe ../scripts/zs/zs.exe] [--script-exe ../scripts/texture_renamer.exe]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), "scripts")
+
+SCRIPT_MODULES = ["merge_json", "report_new_id", "alphabetic_sort", "fix_trailing_comma",
+                  "field_editor", "texture_renamer"]
+
+
+def time_launch(args, runs, cwd=SCRIPTS_DIR, check=True):
+    """Returns (cold_seconds, warm_median_seconds) for launching `args`."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        # The script exes end with "Press Enter to exit"; an empty stdin ends that at once
+        subprocess.run(args, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=None if check else subprocess.DEVNULL, check=check)
+        timings.append(time.perf_counter() - start)
+    return timings[0], statistics.median(timings[1:] or timings)
+
+
+def exe_cases(zs_exe, script_exe):
+    """Built zs against a per-script exe running the same command."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import zs
+
+    zs_exe = os.path.abspath(zs_exe)
+    if script_exe is None:
+        script_exe = os.path.join(os.path.dirname(os.path.dirname(zs_exe)), "texture_renamer.exe")
+    script_exe = os.path.abspath(script_exe)
+    module = os.path.splitext(os.path.basename(script_exe))[0]
+    command = zs.ALIASES[module]
+    return [
+        ("zs.exe --list", [zs_exe, "--list", "--no-pause"]),
+        (f"zs.exe {command}", [zs_exe, command, "--no-pause"]),
+        (os.path.basename(script_exe), [script_exe]),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold and warm startup of the zs dispatcher.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--zs-exe", help="built zs executable to time against a per-script executable")
+    parser.add_argument("--script-exe", help="per-script executable to compare with (default: texture_renamer.exe)")
+    args = parser.parse_args()
+
+    cases = [
+        ("interpreter only", [args.python, "-c", "pass"]),
+        ("zs --list", [args.python, "zs.py", "--list", "--no-pause"]),
+        ("import all scripts", [args.python, "-c", "import " + ", ".join(SCRIPT_MODULES)]),
+    ]
+    for module in SCRIPT_MODULES:
+        cases.append((f"zs import {module}",
+                      [args.python, "-c", f"import zs; zs.load_command(zs.ALIASES['{module}'])"]))
+
+    print(f"{'case':<32} {'cold ms':>9} {'warm ms':>9}")
+    for name, command in cases:
+        cold, warm = time_launch(command, args.runs)
+        print(f"{name:<32} {cold * 1000:>9.1f} {warm * 1000:>9.1f}")
+
+    if args.zs_exe:
+        # An empty folder, so the commands find nothing to change
+        with tempfile.TemporaryDirectory(prefix="zs_startup_") as folder:
+            for name, command in exe_cases(args.zs_exe, args.script_exe):
+                cold, warm = time_launch(command, args.runs, cwd=folder, check=False)
+                print(f"{name:<32} {cold * 1000:>9.1f} {warm * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,8 +24,16 @@ echo "Starting PyInstaller build process..."
 jq -c '.pyinstaller.scripts_to_build[]' "$CONFIG_FILE" | while read -r script; do
     source=$(echo "$script" | jq -r '.source' | tr -d '\r')
     output=$(echo "$script" | jq -r '.output_executable' | tr -d '\r')
+    onedir=$(echo "$script" | jq -r '.onedir // false' | tr -d '\r')
     output_dir=$(dirname "$output")
     executable_name=$(basename "$output")
+    bundle_mode="--onefile"
+    if [ "$onedir" = "true" ]; then
+        # One-folder build: <dir>/<name>/<name>.exe next to its libraries, nothing is unpacked per launch
+        bundle_mode="--onedir"
+        executable_name=$(basename "$output_dir")
+        output_dir=$(dirname "$output_dir")
+    fi
 
     # Check if source file exists
     if [ ! -f "$source" ]; then
@@ -38,7 +46,8 @@ jq -c '.pyinstaller.scripts_to_build[]' "$CONFIG_FILE" | while read -r script; d
 
     # Run PyInstaller
     echo "Building $source -> $output_dir/$executable_name"
-    pyinstaller --onefile --clean --noconfirm "$source" --dist "$output_dir" --name "$executable_name"
+    # --paths . lets zs.py bundle run.py for its gui command
+    pyinstaller "$bundle_mode" --clean --noconfirm "$source" --dist "$output_dir" --name "$executable_name" --paths .
 
     if [ $? -ne 0 ]; then
         echo "Failed to build $source"
@@ -79,6 +88,13 @@ echo "$FILES_TO_COPY" | while read -r file; do
     src=$(echo "$file" | jq -r '.source')
     dest=$(echo "$file" | jq -r '.destination')
 
+    if [ -d "$src" ]; then
+        # One-folder builds are copied as a whole
+        cp -r "$src" "$dest"
+        echo "Copied $src to $dest"
+        continue
+    fi
+
     if [ ! -f "$src" ]; then
         echo "Source file $src does not exist. Skipping."
         continue
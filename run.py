@@ -4,6 +4,11 @@ from tkinter import ttk, filedialog, messagebox
 import os
 import subprocess
 
+# Top-level config sections holding shared settings rather than a script to run
+SETTINGS_SECTIONS = ("instrumentation", "output")
+# zs is built as one folder (zs/zs.exe + its libraries) so it starts without unpacking
+ZS_EXE = os.path.join("zs", "zs.exe")
+
 class JSONEditor:
     def __init__(self, master, json_data, json_path):
         self.master = master
@@ -52,8 +57,9 @@ class JSONEditor:
                     self.build_entry(frame, top_key, top_value, parent_key='')
 
                 # Add Run Button for this top_key
-                run_button = ttk.Button(frame, text="Run", command=lambda tk=top_key: self.run_executable(tk))
-                run_button.pack(pady=5, anchor="e")
+                if top_key not in SETTINGS_SECTIONS:
+                    run_button = ttk.Button(frame, text="Run", command=lambda tk=top_key: self.run_executable(tk))
+                    run_button.pack(pady=5, anchor="e")
         else:
             messagebox.showerror("Error", "The JSON root must be an object/dictionary.")
 
@@ -66,7 +72,7 @@ class JSONEditor:
             label.pack(side="left")
 
             entry = ttk.Entry(frame)
-            entry.insert(0, str(value))
+            entry.insert(0, self.format_value(value))
             entry.pack(side="left", fill="x", expand=True)
 
             full_key = f"{top_key}.{key}"
@@ -80,12 +86,17 @@ class JSONEditor:
         label.pack(side="left")
 
         entry = ttk.Entry(frame)
-        entry.insert(0, str(value))
+        entry.insert(0, self.format_value(value))
         entry.pack(side="left", fill="x", expand=True)
 
         full_key = f"{parent_key}{key}" if parent_key else key
         self.entries[full_key] = entry
 
+    @staticmethod
+    def format_value(value):
+        # JSON text so save_json reads it back with the same type (True would come back as the string "True")
+        return json.dumps(value, ensure_ascii=False)
+
     def save_json(self):
         try:
             updated_data = self.json_data.copy()
@@ -127,13 +138,18 @@ class JSONEditor:
         exe_directory = "./scripts"
         exe_path = os.path.join(exe_directory, exe_name)
         #print(exe_name,exe_directory,exe_path)
-        if not os.path.isfile(exe_path):
+        command = [exe_path]
+        # Prefer the single zs.exe dispatcher, it starts much faster than one exe per script
+        zs_path = os.path.join(exe_directory, ZS_EXE)
+        if os.path.isfile(zs_path):
+            command = [zs_path, top_key]
+        elif not os.path.isfile(exe_path):
             messagebox.showerror("Error", f"Executable '{exe_name}' not found in '{exe_directory}'.")
             return
 
         try:
             # Run the executable
-            subprocess.Popen([exe_path], cwd=exe_directory)
+            subprocess.Popen(command, cwd=exe_directory)
             messagebox.showinfo("Success", f"Executed '{exe_name}' successfully.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to execute '{exe_name}':\n{e}")
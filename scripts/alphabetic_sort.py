@@ -3,6 +3,9 @@ import os
 from collections import OrderedDict
 import sys
 import traceback
+from config_loader import ConfigError, load_config, script_section
+from instrumentation import Metrics
+from atomic_writer import OutputWriter, output_writer
 
 def sort_json(obj):
     if isinstance(obj, dict):
@@ -27,52 +30,55 @@ def sanity_check(input_json, output_json):
             return False
     return True
 
-def main():
-    script_name = os.path.splitext(os.path.basename(__file__))[0]
-    config_path = os.path.join('..', 'scripts_config.json')
+def process_folder(input_folder, output_folder, metrics=None, writer=None):
+    """Sorts every JSON file in input_folder and writes it to output_folder (an OutputWriter if given)."""
+    if metrics is None:
+        metrics = Metrics("alphabetic_sort")
+    os.makedirs(output_folder, exist_ok=True)
 
-    if not os.path.exists(config_path):
-        print(f"Configuration file not found at {config_path}")
-        sys.exit(1)
+    with output_writer(writer) as writer:
+        for filename in os.listdir(input_folder):
+            if filename.endswith('.json'):
+                input_path = os.path.join(input_folder, filename)
+                output_path = os.path.join(output_folder, filename)
 
-    with open(config_path, 'r', encoding='utf-8') as config_file:
-        config = json.load(config_file)
+                with metrics.file(input_path) as fm:
+                    with fm.phase("parse"), open(input_path, 'r', encoding='utf-8') as infile:
+                        try:
+                            data = json.load(infile)
+                        except json.JSONDecodeError:
+                            print(f"JSON decode error in file: {filename}")
+                            continue
+                    fm.track_read(input_path)
+                    fm.count_nodes(data)
 
-    script_config = config.get(script_name)
-    if script_config is None:
-        print(f"No configuration found for script: {script_name}")
-        sys.exit(1)
+                    with fm.phase("transform"):
+                        sorted_data = sort_json(data)
 
-    input_folder = script_config.get('input_folder')
-    output_folder = script_config.get('output_folder')
+                        if not sanity_check(data, sorted_data):
+                            print(f"Sanity check failed for file: {filename}")
+                            sys.exit(1)
 
-    if not input_folder or not output_folder:
-        print("Configuration must include 'input_folder' and 'output_folder'.")
-        sys.exit(1)
+                    with fm.phase("write"):
+                        # ensure_ascii=False preserves proper JSON format
+                        text = json.dumps(sorted_data, indent=4, ensure_ascii=False, quote_keys=True) + '\n'
+                        size = writer.write_text(output_path, text)
+                    fm.track_write(output_path, size)
 
-    os.makedirs(output_folder, exist_ok=True)
-    
-    for filename in os.listdir(input_folder):
-        if filename.endswith('.json'):
-            input_path = os.path.join(input_folder, filename)
-            output_path = os.path.join(output_folder, filename)
-
-            with open(input_path, 'r', encoding='utf-8') as infile:
-                try:
-                    data = json.load(infile)
-                except json.JSONDecodeError:
-                    print(f"JSON decode error in file: {filename}")
-                    continue
-
-            sorted_data = sort_json(data)
+def main():
+    script_name = os.path.splitext(os.path.basename(__file__))[0]
 
-            if not sanity_check(data, sorted_data):
-                print(f"Sanity check failed for file: {filename}")
-                sys.exit(1)
+    try:
+        config = load_config()
+        script_config = script_section(config, script_name)
+        writer = OutputWriter.from_config(config)
+        metrics = Metrics.from_config(script_name, config)
+    except ConfigError as e:
+        print(e)
+        sys.exit(1)
 
-            with open(output_path, 'w', encoding='utf-8') as outfile:
-                json.dump(sorted_data, outfile, indent=4, ensure_ascii=False, quote_keys=True)  # <-- FIX: ensure_ascii=False preserves proper JSON format
-                outfile.write('\n')
+    with metrics.run(), writer:
+        process_folder(script_config['input_folder'], script_config['output_folder'], metrics, writer)
 
 if __name__ == "__main__":
     try:
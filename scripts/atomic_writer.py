@@ -0,0 +1,294 @@
+"""
+Crash-safe output writing shared by all scripts.
+
+Every file is written to a temporary file next to its destination and then
+renamed over it, so an error or Ctrl+C never leaves a truncated file behind
+(important for alphabetic_sort, which sorts change/ in place by default).
+Files whose content would not change are not rewritten and keep their mtime,
+which keeps id_index and watch_merge from redoing work.
+
+OutputWriter additionally queues small files and writes them in batches on a
+background thread while the script carries on with the next file. Settings
+come from the shared "output" section of scripts_config.json:
+    fsync          "none"   - leave flushing to the OS (fastest)
+                   "batch"  - fsync all files of a batch, then rename them
+                   "always" - fsync every file before its rename
+    batch_files    files queued before a batch is handed to the writer thread
+    batch_kb       same, by total size; larger files are written on their own
+    skip_unchanged compare with the existing file and skip identical writes
+
+Usage:
+    with output_writer(writer) as writer:   # uses / closes a writer as needed
+        writer.write_text(path, text)
+"""
+import errno
+import os
+import queue
+import shutil
+import threading
+from contextlib import contextmanager
+
+from config_loader import FSYNC_POLICIES, ConfigError, script_section
+
+DEFAULT_BATCH_FILES = 64
+DEFAULT_BATCH_KB = 1024
+# errno values from fsync on a directory that mean "not supported here", not "not saved"
+UNSUPPORTED_FSYNC_ERRORS = {errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+class OutputError(Exception):
+    """Raised when an OutputWriter is closed after some files could not be saved."""
+
+
+def _same_content(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def _fsync_folder(folder):
+    # Makes the rename itself durable; directories can't be opened on Windows
+    if os.name == "nt":
+        return
+    fd = os.open(folder or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        # Some network / FUSE filesystems can't sync directories; treat that like Windows
+        if e.errno not in UNSUPPORTED_FSYNC_ERRORS:
+            raise
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path):
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{name}.{os.getpid()}.tmp")
+
+
+def _write_temp(tmp_path, data, fsync):
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_atomic(path, data, fsync="none", skip_unchanged=True):
+    """
+    Write bytes to `path` via a temporary file and rename.
+    Returns False if the file already had this content and was left alone.
+    """
+    path = os.fspath(path)
+    if skip_unchanged and _same_content(path, data):
+        return False
+    tmp_path = _temp_path(path)
+    _write_temp(tmp_path, data, fsync != "none")
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    if fsync != "none":
+        _fsync_folder(os.path.dirname(path))
+    return True
+
+
+def copy_atomic(source, path, metadata=True):
+    """shutil.copy2 (or shutil.copy with metadata=False) through a temporary file and rename."""
+    path = os.fspath(path)
+    tmp_path = _temp_path(path)
+    try:
+        (shutil.copy2 if metadata else shutil.copy)(source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def encode_text(text):
+    """Encode like open(path, 'w', encoding='utf-8') would, including Windows newlines."""
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
+class OutputWriter:
+    """Batches small output files onto a background writer thread."""
+
+    def __init__(self, fsync="none", batch_files=DEFAULT_BATCH_FILES, batch_kb=DEFAULT_BATCH_KB,
+                 skip_unchanged=True):
+        if fsync not in FSYNC_POLICIES:
+            raise ConfigError(f"Unknown fsync policy: {fsync!r}")
+        self.fsync = fsync
+        self.batch_files = max(1, batch_files)
+        self.batch_bytes = max(1, int(batch_kb * 1024))
+        self.skip_unchanged = skip_unchanged
+        self.written = 0
+        self.unchanged = 0
+        self.failed = 0
+        self._pending = []
+        self._pending_bytes = 0
+        # A small bound keeps memory in check when the disk is slower than the script
+        self._queue = queue.Queue(maxsize=4)
+        self._thread = None
+        # Counters are also updated from caller threads through write_now()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the "output" section of scripts_config.json (defaults when absent)."""
+        section = script_section(config or {}, "output", required=False)
+        return cls(section["fsync"], section["batch_files"], section["batch_kb"], section["skip_unchanged"])
+
+    def write_text(self, path, text):
+        """Queue text for `path`; returns the number of bytes that will be written."""
+        return self.write_bytes(path, encode_text(text))
+
+    def write_now(self, path, text):
+        """Write text immediately on the calling thread; for callers already running on worker threads."""
+        data = encode_text(text)
+        self._write_one(os.fspath(path), data)
+        return len(data)
+
+    def write_bytes(self, path, data):
+        path = os.fspath(path)
+        if len(data) >= self.batch_bytes:
+            # Large files go alone, after everything queued before them
+            self._submit()
+            self._submit([(path, data)])
+        else:
+            self._pending.append((path, data))
+            self._pending_bytes += len(data)
+            if len(self._pending) >= self.batch_files or self._pending_bytes >= self.batch_bytes:
+                self._submit()
+        return len(data)
+
+    def _submit(self, batch=None):
+        if batch is None:
+            batch, self._pending, self._pending_bytes = self._pending, [], 0
+        if not batch:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+            self._thread.start()
+        self._queue.put(batch)
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is not None:
+                    self._write_batch(batch)
+            except Exception as e:
+                # Never let the thread die: flush() / close() wait for the queue to drain
+                self._failed(f"batch of {len(batch)} files", e)
+            finally:
+                self._queue.task_done()
+            if batch is None:
+                return
+
+    def _write_batch(self, batch):
+        if self.fsync != "batch":
+            for path, data in batch:
+                self._write_one(path, data)
+            return
+        # Write and fsync every file first, then rename them all and sync each folder once.
+        # A path queued twice shares one temp name, so only its last content is kept.
+        staged = []
+        for path, data in dict(batch).items():
+            if self.skip_unchanged and _same_content(path, data):
+                with self._lock:
+                    self.unchanged += 1
+                continue
+            tmp_path = _temp_path(path)
+            try:
+                _write_temp(tmp_path, data, True)
+            except Exception as e:
+                self._failed(path, e)
+                continue
+            staged.append((path, tmp_path))
+        folders = set()
+        for path, tmp_path in staged:
+            try:
+                os.replace(tmp_path, path)
+            except Exception as e:
+                _remove(tmp_path)
+                self._failed(path, e)
+                continue
+            with self._lock:
+                self.written += 1
+            folders.add(os.path.dirname(path))
+        for folder in folders:
+            try:
+                _fsync_folder(folder)
+            except OSError as e:
+                self._failed(folder or ".", e, "sync folder")
+
+    def _write_one(self, path, data):
+        try:
+            changed = write_atomic(path, data, self.fsync, self.skip_unchanged)
+        except Exception as e:
+            self._failed(path, e)
+            return
+        with self._lock:
+            if changed:
+                self.written += 1
+            else:
+                self.unchanged += 1
+
+    def _failed(self, path, error, action="save"):
+        with self._lock:
+            self.failed += 1
+        print(f"Could not {action} {path}: {error}")
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        self._submit()
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, raise_errors=True):
+        """Write everything still queued; raises OutputError if any file failed (unless raise_errors=False)."""
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.unchanged:
+            print(f"{self.unchanged} of {self.written + self.unchanged} output files were unchanged and left as they were.")
+        if self.failed and raise_errors:
+            raise OutputError(f"{self.failed} output write(s) failed, see the messages above.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Don't hide an exception that is already on its way out
+        self.close(raise_errors=exc_type is None)
+        return False
+
+
+@contextmanager
+def output_writer(writer=None, config=None):
+    """Yield `writer` as is, or a new OutputWriter (from `config`) that is closed afterwards."""
+    if writer is not None:
+        yield writer
+        return
+    with OutputWriter.from_config(config) as new_writer:
+        yield new_writer
@@ -0,0 +1,91 @@
+"""
+Compact JSON5 loading for large merges.
+
+Game files repeat the same keys ("item", "items", "price", ...) and short
+values (faction names, item IDs, calibers) hundreds of thousands of times.
+CompactLoader parses with json5 as usual but:
+  - interns every key, so all dicts share one str object per key name;
+  - interns short string values and deduplicates floats / large ints;
+  - stores numeric-only arrays as tuples, and identical ones only once.
+
+The result is still plain dicts, lists and scalars apart from those tuples,
+which merge_json treats like lists (ARRAY_TYPES), so merges give the same
+output. Tuples are immutable, which is what makes sharing identical ones
+safe. CPython only shares dict key tables between instance __dict__s, so
+the key layout sharing here is sharing of the key strings themselves.
+
+A loader keeps its tables between files; use one per run so values repeated
+across files are shared too.
+"""
+import sys
+
+import json5 as json
+
+MAX_INTERNED_LENGTH = 64
+
+
+class CompactLoader:
+    def __init__(self, max_interned_length=MAX_INTERNED_LENGTH):
+        self.max_interned_length = max_interned_length
+        self.strings = {}
+        self.numbers = {}
+        self.arrays = {}
+
+    def _string(self, value):
+        if len(value) <= self.max_interned_length:
+            return self.strings.setdefault(value, value)
+        return value
+
+    # Numbers are keyed by their source text: 1 == 1.0 and 0.0 == -0.0 must not be merged
+    def _parse_float(self, text):
+        value = self.numbers.get(text)
+        if value is None:
+            value = self.numbers[text] = float(text)
+        return value
+
+    def _parse_int(self, text, base=10):
+        value = self.numbers.get(text)
+        if value is None:
+            value = self.numbers[text] = int(text, base)
+        return value
+
+    def _array(self, values):
+        """Compact numeric-only arrays, intern strings inside other arrays."""
+        if not values:
+            return values
+        numeric = True
+        for element in values:
+            element_type = type(element)
+            if element_type is not int and element_type is not float:
+                numeric = False
+                break
+        if numeric:
+            array = tuple(values)
+            # repr keeps (1, 2) and (1.0, 2.0) apart, unlike tuple equality
+            return self.arrays.setdefault(repr(array), array)
+        for index, element in enumerate(values):
+            if type(element) is str:
+                values[index] = self._string(element)
+        return values
+
+    def _object(self, pairs):
+        obj = {}
+        for key, value in pairs:
+            value_type = type(value)
+            if value_type is str:
+                value = self._string(value)
+            elif value_type is list:
+                value = self._array(value)
+            obj[sys.intern(key)] = value
+        return obj
+
+    def loads(self, text):
+        return json.loads(text, object_pairs_hook=self._object,
+                          parse_float=self._parse_float, parse_int=self._parse_int)
+
+    def load(self, fp):
+        return self.loads(fp.read())
+
+    def load_file(self, file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return self.load(f)
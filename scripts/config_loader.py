@@ -0,0 +1,263 @@
+"""
+Loading and validation of scripts_config.json.
+
+Each script's section is checked once against SCHEMAS (types, allowed values,
+defaults) instead of being injected into globals(). merge_json settings are
+further compiled into an immutable MergeSettings whose excluded fields are
+frozensets, so the merge recursion only does constant-time lookups.
+
+Excluded field syntax:
+    "name"           - excluded at any depth
+    "data.*.name"    - "name" excluded only directly under an ID in "data"
+    "data.ak74"      - ID "ak74" under "data" excluded
+The legacy string form "['faction','name']" is still accepted.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Mapping, Tuple
+
+import json5 as json
+
+CONFIG_PATH = os.path.join('..', 'scripts_config.json')
+
+REQUIRED = object()
+
+ARRAY_MERGE_STRATEGIES = ("ignore", "merge", "replace")
+NEW_ID_STRATEGIES = ("ignore", "merge", "only", "only_ask")
+FSYNC_POLICIES = ("none", "batch", "always")
+
+# field -> (accepted types, default or REQUIRED, allowed values or None)
+SCHEMAS = {
+    "alphabetic_sort": {
+        "input_folder": (str, REQUIRED, None),
+        "output_folder": (str, REQUIRED, None),
+    },
+    "fix_trailing_comma": {
+        "input_folder": (str, REQUIRED, None),
+        "output_folder": (str, REQUIRED, None),
+        "concurrency": (int, 1, None),
+    },
+    "texture_renamer": {
+        "concurrency": (int, 1, None),
+    },
+    "report_new_id": {
+        "input_folder": (str, REQUIRED, None),
+        "change_folder": (str, REQUIRED, None),
+        "output_folder": (str, REQUIRED, None),
+    },
+    "field_editor": {
+        "input_folder": (str, REQUIRED, None),
+        "output_folder": (str, REQUIRED, None),
+        "field": (str, REQUIRED, None),
+        "adder": ((int, float), 0, None),
+        "multiplier": ((int, float), 1, None),
+    },
+    "id_index": {
+        "data_folder": (str, REQUIRED, None),
+        "index_file": (str, REQUIRED, None),
+    },
+    "merge_json": {
+        "input_folder": (str, REQUIRED, None),
+        "change_folder": (str, REQUIRED, None),
+        "output_folder": (str, REQUIRED, None),
+        "excluded_fields": ((list, str), [], None),
+        "array_merge_strategy": (str, "merge", ARRAY_MERGE_STRATEGIES),
+        "new_id_strategy": (str, "merge", NEW_ID_STRATEGIES),
+        "compact_load": (bool, False, None),
+        "skip_identical": (bool, False, None),
+    },
+    "instrumentation": {
+        "enabled": (bool, False, None),
+        "profile": (bool, False, None),
+        "metrics_folder": (str, ".", None),
+        "top_n": (int, 10, None),
+    },
+    "output": {
+        "fsync": (str, "none", FSYNC_POLICIES),
+        "batch_files": (int, 64, None),
+        "batch_kb": ((int, float), 1024, None),
+        "skip_unchanged": (bool, True, None),
+    },
+    "watch_merge": {
+        "debounce_ms": ((int, float), 200, None),
+        "poll_interval_ms": ((int, float), 500, None),
+    },
+}
+
+
+class ConfigError(Exception):
+    """Raised when scripts_config.json is missing or a section is invalid."""
+
+
+def load_config(config_path=CONFIG_PATH):
+    """Read the whole config file."""
+    if not os.path.exists(config_path):
+        raise ConfigError(f"Configuration file not found at {config_path}")
+    with open(config_path, 'r', encoding='utf-8') as config_file:
+        try:
+            config = json.load(config_file)
+        except ValueError as e:
+            raise ConfigError(f"Could not parse {config_path}: {e}")
+    if not isinstance(config, dict):
+        raise ConfigError(f"{config_path} must contain an object at the top level.")
+    return config
+
+
+def script_section(config, script_name, required=True):
+    """
+    Validate a script's section against its schema and return it with defaults filled in.
+    With required=False a missing section yields just the defaults.
+    """
+    section = config.get(script_name)
+    if section is None and not required:
+        section = {}
+    if section is None:
+        raise ConfigError(f"No configuration found for script: {script_name}")
+    if not isinstance(section, dict):
+        raise ConfigError(f"Configuration for {script_name} must be an object.")
+    schema = SCHEMAS.get(script_name, {})
+
+    validated = {}
+    for key, (types, default, allowed) in schema.items():
+        if key not in section:
+            if default is REQUIRED:
+                raise ConfigError(f"Configuration for {script_name} must include '{key}'.")
+            validated[key] = default
+            continue
+        value = section[key]
+        # Older run.exe versions saved booleans back as "True" / "False"
+        if types is bool and isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            value = value.strip().lower() == "true"
+        # bool is an int subclass, only accept it where bool is asked for
+        if not isinstance(value, types) or (isinstance(value, bool) and types is not bool):
+            raise ConfigError(f"'{script_name}.{key}' has invalid value {value!r}.")
+        # Required folders / names can't be left blank either
+        if default is REQUIRED and isinstance(value, str) and not value.strip():
+            raise ConfigError(f"'{script_name}.{key}' must not be empty.")
+        if allowed is not None and value not in allowed:
+            raise ConfigError(f"'{script_name}.{key}' must be one of {', '.join(allowed)}, got {value!r}.")
+        validated[key] = value
+
+    for key in section:
+        if key not in schema:
+            print(f"Warning: unknown setting '{script_name}.{key}' ignored.")
+    return validated
+
+
+def parse_field_list(value):
+    """Accept a list of names or the legacy "['a','b']" string form."""
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = text.strip("[]").split(",")
+        if isinstance(value, str):
+            value = [value]
+    names = []
+    for name in value:
+        if not isinstance(name, str):
+            raise ConfigError(f"Excluded field {name!r} must be a string.")
+        name = name.strip().strip("'\"")
+        if name:
+            names.append(name)
+    return names
+
+
+def _path_matches(pattern, path):
+    if len(pattern) != len(path):
+        return False
+    for part, key in zip(pattern, path):
+        if part != "*" and part != key:
+            return False
+    return True
+
+
+@dataclass(frozen=True)
+class ExcludedFields:
+    """Compiled excluded_fields: global names plus path-scoped names."""
+    names: FrozenSet[str] = frozenset()
+    # (key, parent path pattern) pairs; hashed / compared for settings identity
+    scoped: FrozenSet[Tuple[str, Tuple[str, ...]]] = frozenset()
+    # key -> parent path patterns, the lookup form of `scoped`
+    _by_key: Mapping[str, Tuple[Tuple[str, ...], ...]] = field(default_factory=dict, compare=False, hash=False, repr=False)
+
+    @classmethod
+    def compile(cls, fields):
+        """Build from a list of field specs (see module docstring), a legacy string, or None."""
+        if isinstance(fields, ExcludedFields):
+            return fields
+        names = set()
+        by_key: Dict[str, list] = {}
+        for spec in parse_field_list(fields or []):
+            parts = tuple(spec.split("."))
+            if len(parts) == 1:
+                names.add(spec)
+            else:
+                by_key.setdefault(parts[-1], []).append(parts[:-1])
+        scoped = frozenset((key, pattern) for key, patterns in by_key.items() for pattern in patterns)
+        return cls(frozenset(names), scoped, {key: tuple(patterns) for key, patterns in by_key.items()})
+
+    @property
+    def has_scoped(self):
+        return bool(self.scoped)
+
+    def excludes(self, key, path=()):
+        """True if `key` inside the object at `path` (tuple of parent keys) is excluded."""
+        if key in self.names:
+            return True
+        patterns = self._by_key.get(key)
+        if patterns is None:
+            return False
+        for pattern in patterns:
+            if _path_matches(pattern, path):
+                return True
+        return False
+
+
+NO_EXCLUSIONS = ExcludedFields()
+
+
+@dataclass(frozen=True)
+class MergeSettings:
+    """Immutable, validated merge_json settings."""
+    array_merge_strategy: str = "merge"
+    new_id_strategy: str = "merge"
+    excluded: ExcludedFields = NO_EXCLUSIONS
+    # Leave IDs / items objects alone when the delta is an unchanged copy of the parent's
+    skip_identical: bool = False
+
+    def __post_init__(self):
+        if self.array_merge_strategy not in ARRAY_MERGE_STRATEGIES:
+            raise ConfigError(f"Unknown array_merge_strategy: {self.array_merge_strategy!r}")
+        if self.new_id_strategy not in NEW_ID_STRATEGIES:
+            raise ConfigError(f"Unknown new_id_strategy: {self.new_id_strategy!r}")
+
+    @classmethod
+    def create(cls, array_merge_strategy="merge", new_id_strategy="merge", excluded_fields=None,
+               skip_identical=False):
+        return cls(array_merge_strategy, new_id_strategy, ExcludedFields.compile(excluded_fields), skip_identical)
+
+    @classmethod
+    def from_section(cls, section):
+        """Build from a validated merge_json config section."""
+        return cls.create(section["array_merge_strategy"], section["new_id_strategy"], section["excluded_fields"],
+                          section["skip_identical"])
+
+    def for_object_arrays(self):
+        """Settings used when merging matching objects inside arrays of {item: ...}."""
+        return _object_array_settings(self)
+
+
+_object_array_cache: Dict[Any, MergeSettings] = {}
+
+
+def _object_array_settings(settings):
+    # Objects inside arrays are always merged with the "merge" array strategy and no exclusions
+    cached = _object_array_cache.get(settings)
+    if cached is None:
+        cached = MergeSettings("merge", settings.new_id_strategy, NO_EXCLUSIONS, settings.skip_identical)
+        _object_array_cache[settings] = cached
+    return cached
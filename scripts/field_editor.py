@@ -3,6 +3,9 @@ import json5 as json
 import sys
 from typing import Any, List, Tuple
 import traceback
+from config_loader import ConfigError, load_config, script_section
+from instrumentation import Metrics, NULL_FILE_METRICS
+from atomic_writer import OutputWriter, output_writer
 
 def update_field_in_json(data: Any, field: str, adder: int, multiplier: int, updates: List[Tuple[int, int]]) -> Any:
     if isinstance(data, dict):
@@ -18,14 +21,20 @@ def update_field_in_json(data: Any, field: str, adder: int, multiplier: int, upd
             data[index] = update_field_in_json(item, field, adder, multiplier, updates)
     return data
 
-def process_file(input_file_path: str, output_file_path: str, field: str, adder: int, multiplier: int):
+def process_file(input_file_path: str, output_file_path: str, field: str, adder: int, multiplier: int, fm=NULL_FILE_METRICS,
+                 writer: OutputWriter = None):
     updates = []
     try:
-        with open(input_file_path, 'r', encoding='utf-8') as infile:
-            data = json.load(infile)
-        updated_data = update_field_in_json(data, field, adder, multiplier, updates)
-        with open(output_file_path, 'w', encoding='utf-8') as outfile:
-            json.dump(updated_data, outfile, indent=4, ensure_ascii=False, quote_keys=True)
+        with fm.phase("parse"):
+            with open(input_file_path, 'r', encoding='utf-8') as infile:
+                data = json.load(infile)
+        fm.track_read(input_file_path)
+        fm.count_nodes(data)
+        with fm.phase("transform"):
+            updated_data = update_field_in_json(data, field, adder, multiplier, updates)
+        with fm.phase("write"), output_writer(writer) as out:
+            size = out.write_text(output_file_path, json.dumps(updated_data, indent=4, ensure_ascii=False, quote_keys=True))
+        fm.track_write(output_file_path, size)
         print(f'Processing file: {input_file_path} -> {output_file_path}')
         if updates:
             updates_str = ', '.join([f'{orig} -> {new}' for orig, new in updates])
@@ -39,36 +48,39 @@ def process_file(input_file_path: str, output_file_path: str, field: str, adder:
     except Exception as e:
         print(f'Error processing file {input_file_path}: {e}')
 
-def process_folder(input_folder: str, output_folder: str, field: str, adder: int, multiplier: int):
+def process_folder(input_folder: str, output_folder: str, field: str, adder: int, multiplier: int, metrics: Metrics = None,
+                   writer: OutputWriter = None):
+    if metrics is None:
+        metrics = Metrics("field_editor")
     if not os.path.isdir(input_folder):
         print(f'The input path "{input_folder}" is not a valid directory.')
         return
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
-    for filename in os.listdir(input_folder):
-        input_file_path = os.path.join(input_folder, filename)
-        if not os.path.isfile(input_file_path):
-            continue
-        if not filename.lower().endswith('.json'):
-            continue
-        output_file_path = os.path.join(output_folder, filename)
-        process_file(input_file_path, output_file_path, field, adder, multiplier)
+    with output_writer(writer) as writer:
+        for filename in os.listdir(input_folder):
+            input_file_path = os.path.join(input_folder, filename)
+            if not os.path.isfile(input_file_path):
+                continue
+            if not filename.lower().endswith('.json'):
+                continue
+            output_file_path = os.path.join(output_folder, filename)
+            with metrics.file(input_file_path) as fm:
+                process_file(input_file_path, output_file_path, field, adder, multiplier, fm, writer)
 
 def main():
     script_name = os.path.splitext(os.path.basename(__file__))[0]
-    config_path = os.path.join('..', 'scripts_config.json')
-    if not os.path.exists(config_path):
-        print(f"Configuration file not found at {config_path}")
-        sys.exit(1)
-    with open(config_path, 'r') as config_file:
-        config = json.load(config_file)
-    script_config = config.get(script_name)
-    if script_config is None:
-        print(f"No configuration found for script: {script_name}")
+    try:
+        config = load_config()
+        script_config = script_section(config, script_name)
+        writer = OutputWriter.from_config(config)
+        metrics = Metrics.from_config(script_name, config)
+    except ConfigError as e:
+        print(e)
         sys.exit(1)
-    for key, value in script_config.items():
-        globals()[key] = value
-    process_folder(input_folder, output_folder, field, adder, multiplier)
+    with metrics.run(), writer:
+        process_folder(script_config['input_folder'], script_config['output_folder'], script_config['field'],
+                       script_config['adder'], script_config['multiplier'], metrics, writer)
 
 if __name__ == "__main__":
     try:
@@ -1,8 +1,11 @@
 import os
-import json5 as json
 import re
 import sys
 import traceback
+from config_loader import ConfigError, load_config, script_section
+from instrumentation import Metrics
+from atomic_writer import OutputWriter, output_writer
+from async_pipeline import Progress, run_pipeline
 
 def remove_trailing_commas(json_str):
     """
@@ -12,14 +15,32 @@ def remove_trailing_commas(json_str):
     pattern = r',\s*(\]|\})'
     return re.sub(pattern, r'\1', json_str)
 
-def process_json_files(input_folder, output_folder):
+def clean_file(input_path, output_path, metrics, write):
+    """Clean one file; `write` is writer.write_text or, on pipeline threads, writer.write_now."""
+    with metrics.file(input_path) as fm:
+        with fm.phase("parse"), open(input_path, 'r', encoding='utf-8') as f:
+            data_str = f.read()
+        fm.track_read(input_path)
+
+        with fm.phase("transform"):
+            cleaned_str = remove_trailing_commas(data_str)
+
+        with fm.phase("write"):
+            size = write(output_path, cleaned_str)
+        fm.track_write(output_path, size)
+
+def process_json_files(input_folder, output_folder, metrics=None, writer=None, concurrency=1):
     """
     Processes all JSON files in the input_folder by removing trailing commas
-    and saves the cleaned JSON files to the output_folder.
+    and saves the cleaned JSON files to the output_folder (through `writer`, an OutputWriter, if given).
+    With concurrency > 1 up to that many files are read / cleaned / written at once (see async_pipeline).
     """
+    if metrics is None:
+        metrics = Metrics("fix_trailing_comma")
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
+    jobs = []
     for root, _, files in os.walk(input_folder):
         # Determine the relative path to maintain folder structure
         relative_path = os.path.relpath(root, input_folder)
@@ -29,44 +50,37 @@ def process_json_files(input_folder, output_folder):
 
         for filename in files:
             if filename.lower().endswith('.json'):
-                input_path = os.path.join(root, filename)
-                output_path = os.path.join(target_folder, filename)
+                jobs.append((os.path.join(root, filename), os.path.join(target_folder, filename)))
 
-                with open(input_path, 'r', encoding='utf-8') as f:
-                    data_str = f.read()
-
-                cleaned_str = remove_trailing_commas(data_str)
-
-                with open(output_path, 'w', encoding='utf-8') as out_f:
-                    out_f.write(cleaned_str)
+    with output_writer(writer) as writer:
+        if concurrency > 1:
+            progress = Progress(len(jobs), "files cleaned")
+            run_pipeline(jobs, lambda job: clean_file(job[0], job[1], metrics, writer.write_now),
+                         concurrency, progress)
+            print(progress.summary())
+        else:
+            for input_path, output_path in jobs:
+                clean_file(input_path, output_path, metrics, writer.write_text)
 
 def main():
     # Get the script name without the .py extension
     script_name = os.path.splitext(os.path.basename(__file__))[0]
     
-    # Define the path to config.json relative to the script's location
-    config_path = os.path.join('..', 'scripts_config.json')  # Adjust the path as needed
-    
-    # Check if config.json exists
-    if not os.path.exists(config_path):
-        print(f"Configuration file not found at {config_path}")
-        sys.exit(1)
-    
-    # Load the JSON configuration
-    with open(config_path, 'r') as config_file:
-        config = json.load(config_file)
-    
-    # Retrieve the configuration for the current script
-    script_config = config.get(script_name)
-    if script_config is None:
-        print(f"No configuration found for script: {script_name}")
+    # Load ../scripts_config.json and validate this script's section
+    try:
+        config = load_config()
+        script_config = script_section(config, script_name)
+        writer = OutputWriter.from_config(config)
+        metrics = Metrics.from_config(script_name, config)
+    except ConfigError as e:
+        print(e)
         sys.exit(1)
-    
-    # Dynamically assign configuration parameters as variables
-    for key, value in script_config.items():
-        globals()[key] = value
 
-    process_json_files(input_folder, output_folder)
+    input_folder = script_config['input_folder']
+    output_folder = script_config['output_folder']
+
+    with metrics.run(), writer:
+        process_json_files(input_folder, output_folder, metrics, writer, script_config['concurrency'])
     print(f"Trailing commas removed. Cleaned files are saved in '{output_folder}'.")
 
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+"""
+Inverted index of item IDs across a game data folder.
+
+Records where every ID under "data" is defined and where every items[].item
+references it (file + JSON path). The index is saved to disk and only files
+whose mtime or size changed are re-parsed on the next run. Items referenced
+but never defined (dangling references) are found from the same index.
+
+Usage (from the scripts folder, settings in the "id_index" config section):
+    id_index                  update the index and print a summary
+    id_index query ID [ID..]  show where IDs are defined and referenced
+    id_index dangling         list references to IDs that are never defined
+
+Library use:
+    index = IdIndex.open(data_folder, index_file)
+    index.update()
+    index.lookup("ak74")   # {"defined": [(file, path)], "referenced": [(file, path)]}
+"""
+import json as std_json
+import os
+import sys
+import traceback
+
+import json5 as json
+
+from config_loader import ConfigError, load_config, script_section
+from instrumentation import Metrics
+from atomic_writer import write_atomic
+
+INDEX_VERSION = 1
+
+
+def extract_ids(data):
+    """Return (defines, references) dicts of id -> [json path] for one parsed file."""
+    defines = {}
+    references = {}
+    if isinstance(data, dict) and isinstance(data.get("data"), dict):
+        for id_key in data["data"]:
+            defines.setdefault(id_key, []).append(f"data.{id_key}")
+
+    stack = [(data, "")]
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                child_path = f"{path}.{key}" if path else key
+                if key == "items" and isinstance(value, list):
+                    for index, entry in enumerate(value):
+                        entry_path = f"{child_path}[{index}]"
+                        if isinstance(entry, dict) and isinstance(entry.get("item"), str):
+                            references.setdefault(entry["item"], []).append(f"{entry_path}.item")
+                        stack.append((entry, entry_path))
+                elif isinstance(value, (dict, list)):
+                    stack.append((value, child_path))
+        elif isinstance(node, list):
+            for index, entry in enumerate(node):
+                if isinstance(entry, (dict, list)):
+                    stack.append((entry, f"{path}[{index}]"))
+    return defines, references
+
+
+class IdIndex:
+    """On-disk index of ID definitions and references, updated incrementally."""
+
+    def __init__(self, data_folder, index_file, files=None):
+        self.data_folder = data_folder
+        self.index_file = index_file
+        # relative file path -> {"mtime", "size", "defines", "references"}
+        self.files = files or {}
+        self._defined = None
+        self._referenced = None
+
+    @classmethod
+    def open(cls, data_folder, index_file):
+        """Load a saved index, or start an empty one if it is missing or outdated."""
+        files = {}
+        if os.path.exists(index_file):
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    saved = std_json.load(f)
+                if saved.get("version") == INDEX_VERSION:
+                    files = saved.get("files", {})
+            except ValueError:
+                print(f"Index file {index_file} is corrupt, rebuilding.")
+        return cls(data_folder, index_file, files)
+
+    def update(self, metrics=None):
+        """Re-parse new or modified files, drop deleted ones. Returns (parsed, removed) counts."""
+        if metrics is None:
+            metrics = Metrics("id_index")
+        seen = set()
+        parsed = 0
+        for root, _, filenames in os.walk(self.data_folder):
+            for filename in filenames:
+                if not filename.lower().endswith('.json'):
+                    continue
+                path = os.path.join(root, filename)
+                rel_path = os.path.relpath(path, self.data_folder).replace(os.sep, "/")
+                seen.add(rel_path)
+                stat = os.stat(path)
+                entry = self.files.get(rel_path)
+                if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                    continue
+
+                with metrics.file(path) as fm:
+                    try:
+                        with fm.phase("parse"), open(path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                    except ValueError as e:
+                        print(f"JSON decode error in file {path}: {e}")
+                        self.files.pop(rel_path, None)
+                        continue
+                    fm.track_read(path)
+                    fm.count_nodes(data)
+                    with fm.phase("transform"):
+                        defines, references = extract_ids(data)
+                self.files[rel_path] = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "defines": defines,
+                    "references": references,
+                }
+                parsed += 1
+
+        removed = [rel_path for rel_path in self.files if rel_path not in seen]
+        for rel_path in removed:
+            del self.files[rel_path]
+        self._defined = self._referenced = None
+        return parsed, len(removed)
+
+    def save(self):
+        folder = os.path.dirname(self.index_file)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        text = std_json.dumps({"version": INDEX_VERSION, "files": self.files}, ensure_ascii=False)
+        write_atomic(self.index_file, text.encode("utf-8"))
+
+    def _build_maps(self):
+        defined = {}
+        referenced = {}
+        for rel_path, entry in self.files.items():
+            for id_key, paths in entry["defines"].items():
+                defined.setdefault(id_key, []).extend((rel_path, p) for p in paths)
+            for id_key, paths in entry["references"].items():
+                referenced.setdefault(id_key, []).extend((rel_path, p) for p in paths)
+        self._defined = defined
+        self._referenced = referenced
+
+    @property
+    def defined(self):
+        """id -> [(file, json path)] of definitions."""
+        if self._defined is None:
+            self._build_maps()
+        return self._defined
+
+    @property
+    def referenced(self):
+        """id -> [(file, json path)] of items[].item references."""
+        if self._referenced is None:
+            self._build_maps()
+        return self._referenced
+
+    def lookup(self, id_key):
+        return {
+            "defined": self.defined.get(id_key, []),
+            "referenced": self.referenced.get(id_key, []),
+        }
+
+    def dangling(self):
+        """Referenced IDs that are never defined: id -> [(file, json path)]."""
+        defined = self.defined
+        return {id_key: locations for id_key, locations in self.referenced.items() if id_key not in defined}
+
+
+def print_locations(title, locations):
+    print(f"  {title} ({len(locations)}):")
+    for rel_path, path in locations:
+        print(f"    {rel_path}: {path}")
+
+
+def main():
+    script_name = os.path.splitext(os.path.basename(__file__))[0]
+    try:
+        config = load_config()
+        script_config = script_section(config, script_name)
+        metrics = Metrics.from_config(script_name, config)
+    except ConfigError as e:
+        print(e)
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    index = IdIndex.open(script_config['data_folder'], script_config['index_file'])
+
+    with metrics.run():
+        parsed, removed = index.update(metrics)
+    if parsed or removed:
+        index.save()
+    print(f"Index: {len(index.files)} files ({parsed} re-parsed, {removed} removed), "
+          f"{len(index.defined)} IDs defined, {len(index.referenced)} IDs referenced.")
+
+    if args and args[0] == "query":
+        for id_key in args[1:]:
+            result = index.lookup(id_key)
+            print(f"\n{id_key}:")
+            print_locations("defined", result["defined"])
+            print_locations("referenced", result["referenced"])
+    elif not args or args[0] == "dangling":
+        dangling = index.dangling()
+        print(f"\n{len(dangling)} referenced IDs are never defined.")
+        if args:
+            for id_key in sorted(dangling):
+                print(f"\n{id_key}:")
+                print_locations("referenced", dangling[id_key])
+    else:
+        print(f"Unknown command: {' '.join(args)}. Use 'query ID [ID..]' or 'dangling'.")
+
+if __name__ == "__main__":
+    try:
+        main()
+        print("Script finished successfully.")
+    except Exception as e:
+        error_message = traceback.format_exc()
+        print("An error occurred:\n", error_message)
+    finally:
+        input("\nPress Enter to exit...")
@@ -0,0 +1,253 @@
+"""
+Shared timing / metrics layer for the scripts.
+
+Enabled by the "instrumentation" section of scripts_config.json or by the
+ZS_METRICS=1 environment variable (ZS_PROFILE=1 additionally turns on cProfile).
+When disabled every call is a cheap no-op, so the scripts can instrument their
+hot paths unconditionally.
+
+Usage inside a script:
+    metrics = Metrics.from_config(script_name, config)
+    with metrics.run():
+        for path in files:
+            with metrics.file(path) as fm:
+                with fm.phase("parse"):
+                    data = load(path)
+                fm.track_read(path)
+                fm.count_nodes(data)
+                with fm.phase("transform"):
+                    ...
+                with fm.phase("write"):
+                    size = writer.write_text(out_path, text)
+                fm.track_write(out_path, size)
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from config_loader import script_section
+
+ENV_METRICS = "ZS_METRICS"
+ENV_PROFILE = "ZS_PROFILE"
+
+_current_file = None
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def count_nodes(obj):
+    """Number of dicts, lists and scalars in a parsed JSON document."""
+    count = 0
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+class _NullFileMetrics:
+    """Stand-in used when instrumentation is disabled."""
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def track_read(self, path):
+        pass
+
+    def track_write(self, path, size=None):
+        pass
+
+    def count_nodes(self, obj):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_FILE_METRICS = _NullFileMetrics()
+
+
+class FileMetrics:
+    """Per-file phase timings and counters."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.phases = {}
+        self.nodes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.total = 0.0
+        self._start = None
+        # [name, start] of the running phases, innermost last
+        self._active = []
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase. A nested phase pauses the enclosing one, so e.g. a prompt
+        inside "transform" is counted as "prompt" only.
+        """
+        now = time.perf_counter()
+        if self._active:
+            outer = self._active[-1]
+            self._add(outer[0], now - outer[1])
+        current = [name, now]
+        self._active.append(current)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._active.pop()
+            self._add(name, now - current[1])
+            if self._active:
+                # The enclosing phase resumes from here
+                self._active[-1][1] = now
+
+    def _add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def track_read(self, path):
+        if os.path.isfile(path):
+            self.bytes_read += os.path.getsize(path)
+
+    def track_write(self, path, size=None):
+        """'size' is given for writes queued on an OutputWriter, which may not be on disk yet."""
+        if size is not None:
+            self.bytes_written += size
+        elif os.path.isfile(path):
+            self.bytes_written += os.path.getsize(path)
+
+    def count_nodes(self, obj):
+        self.nodes += count_nodes(obj)
+
+    def __enter__(self):
+        global _current_file
+        _current_file = self
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _current_file
+        self.total = time.perf_counter() - self._start
+        _current_file = None
+        return False
+
+    def as_dict(self):
+        return {
+            "path": self.path,
+            "total_seconds": round(self.total, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "nodes": self.nodes,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+        }
+
+
+def current_file():
+    """FileMetrics of the file being processed, for code deep in the call stack (e.g. prompts)."""
+    return _current_file if _current_file is not None else NULL_FILE_METRICS
+
+
+class Metrics:
+    """Collects FileMetrics for one script run and reports them at the end."""
+
+    def __init__(self, script_name, enabled=False, profile=False, metrics_folder=".", top_n=10):
+        self.script_name = script_name
+        self.enabled = enabled
+        self.profile = enabled and profile
+        self.metrics_folder = metrics_folder
+        self.top_n = top_n
+        self.files = []
+
+    @classmethod
+    def from_config(cls, script_name, config):
+        """
+        Build from the "instrumentation" section of scripts_config.json plus environment overrides.
+        Raises ConfigError when the section is invalid.
+        """
+        section = script_section(config or {}, "instrumentation", required=False)
+        return cls(
+            script_name,
+            enabled=section["enabled"] or _env_flag(ENV_METRICS),
+            profile=section["profile"] or _env_flag(ENV_PROFILE),
+            metrics_folder=section["metrics_folder"] or ".",
+            top_n=section["top_n"],
+        )
+
+    def file(self, path):
+        if not self.enabled:
+            return NULL_FILE_METRICS
+        file_metrics = FileMetrics(path)
+        self.files.append(file_metrics)
+        return file_metrics
+
+    @contextmanager
+    def run(self):
+        """Wrap a whole script run: optional profiling, then metrics file and summary."""
+        if not self.enabled:
+            yield self
+            return
+        profiler = None
+        if self.profile:
+            # Imported here: cProfile / pstats add noticeably to every script's startup
+            import cProfile
+            profiler = cProfile.Profile()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler:
+                profiler.disable()
+            self.report(time.perf_counter() - start, profiler)
+
+    def report(self, elapsed, profiler=None):
+        import json
+        os.makedirs(self.metrics_folder, exist_ok=True)
+        metrics_path = os.path.join(self.metrics_folder, f"{self.script_name}_metrics.json")
+        summary = {
+            "script": self.script_name,
+            "total_seconds": round(elapsed, 6),
+            "files": len(self.files),
+            "bytes_read": sum(f.bytes_read for f in self.files),
+            "bytes_written": sum(f.bytes_written for f in self.files),
+            "nodes": sum(f.nodes for f in self.files),
+            "phases": {},
+        }
+        for file_metrics in self.files:
+            for name, seconds in file_metrics.phases.items():
+                summary["phases"][name] = round(summary["phases"].get(name, 0.0) + seconds, 6)
+        with open(metrics_path, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "files": [fm.as_dict() for fm in self.files]}, f, indent=4)
+
+        print(f"\n=== Metrics: {self.script_name} ({elapsed:.3f}s, {len(self.files)} files) ===")
+        for name, seconds in summary["phases"].items():
+            print(f"  {name:<10} {seconds:.3f}s")
+        slowest = sorted(self.files, key=lambda fm: fm.total, reverse=True)[:self.top_n]
+        if slowest:
+            print(f"Top {len(slowest)} slowest files:")
+            for fm in slowest:
+                phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in fm.phases.items())
+                print(f"  {fm.total:.3f}s  {fm.path}  ({phases})")
+        print(f"Metrics saved to '{metrics_path}'.")
+
+        if profiler:
+            profile_path = os.path.join(self.metrics_folder, f"{self.script_name}.prof")
+            profiler.dump_stats(profile_path)
+            import io
+            import pstats
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(self.top_n)
+            print(stream.getvalue())
+            print(f"Profile saved to '{profile_path}'.")
@@ -1,27 +1,66 @@
 #!/usr/bin/env python3
 import os
 import json5 as json
-import shutil
 from pathlib import Path
 import sys
 import traceback
+from functools import partial
+from instrumentation import Metrics, current_file
+from config_loader import ConfigError, MergeSettings, load_config, script_section
+from compact_json import CompactLoader
+from atomic_writer import OutputWriter, copy_atomic, output_writer
 
-def load_json(file_path):
-    """Safely load JSON from a file, returning None on error."""
+ARRAY_TYPES = (list, tuple)
+
+def load_json(file_path, loader=None):
+    """Safely load JSON from a file, returning None on error. 'loader' is an optional CompactLoader."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            return loader.load(f) if loader else json.load(f)
     except Exception as e:
         print(f"Could not load {file_path}: {e}")
         return None
 
-def save_json(data, file_path):
-    """Save Python object as JSON with indentation."""
+def save_json(data, file_path, writer=None):
+    """Save Python object as JSON with indentation, through `writer` (an OutputWriter) if given. Returns the size."""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False, quote_keys=True)
+        text = json.dumps(data, indent=4, ensure_ascii=False, quote_keys=True)
+        with output_writer(writer) as out:
+            return out.write_text(file_path, text)
     except Exception as e:
         print(f"Could not save {file_path}: {e}")
+        return 0
+
+def ask(question):
+    """Prompt the user; time spent waiting is recorded as the "prompt" phase."""
+    with current_file().phase("prompt"):
+        return input(question)
+
+class SkipStats:
+    """How many entries skip_identical compared and left alone, for the end-of-run summary."""
+
+    def __init__(self):
+        self.compared = 0
+        self.skipped = 0
+
+    def summary(self):
+        share = 100 * self.skipped / self.compared if self.compared else 0.0
+        return (f"skip_identical: {self.skipped} of {self.compared} existing IDs / items objects "
+                f"were unchanged copies and left as they were ({share:.1f}%).")
+
+def is_unchanged_copy(parent_value, delta_value, stats=None):
+    """
+    True when delta_value equals parent_value and the merge can be skipped.
+    A single C-level == that stops at the first difference, far cheaper than the recursion.
+    The parent's entry is kept as is: its string arrays are not re-merged (reordered) and
+    1, 1.0 and true count as equal.
+    """
+    identical = parent_value == delta_value
+    if stats is not None:
+        stats.compared += 1
+        if identical:
+            stats.skipped += 1
+    return identical
 
 def merge_string_arrays(parent_list, delta_list, strategy):
     """Merge two lists of strings according to the specified strategy."""
@@ -29,14 +68,14 @@ def merge_string_arrays(parent_list, delta_list, strategy):
         return parent_list
     elif strategy == "merge":
         # Merge uniquely
-        return list(set(parent_list + delta_list))
+        return list(set(list(parent_list) + list(delta_list)))
     elif strategy == "replace":
         # Replace entirely
         return delta_list
     # Fallback
     return parent_list
 
-def merge_object_arrays(parent_list, delta_list, new_id_strategy):
+def merge_object_arrays(parent_list, delta_list, new_id_strategy, settings=None, stats=None):
     """
     Merge arrays of objects based on 'item' as an identifier.
     - "merge": If delta has an object with an 'item' that doesn't exist in parent, add it.
@@ -44,6 +83,9 @@ def merge_object_arrays(parent_list, delta_list, new_id_strategy):
     - "only":  Only add new objects (by ID); existing objects remain untouched.
     - "only_ask": Same as "only" but prompt the user for each new object.
     """
+    if settings is None:
+        settings = MergeSettings.create(new_id_strategy=new_id_strategy)
+    item_settings = settings.for_object_arrays()
     parent_dict = {}
     delta_dict = {}
 
@@ -58,10 +100,9 @@ def merge_object_arrays(parent_list, delta_list, new_id_strategy):
     for key, val in delta_dict.items():
         if key in parent_dict:
             if new_id_strategy == "merge":
-                parent_dict[key] = merge_json(parent_dict[key], val,
-                                              array_merge_strategy="merge",
-                                              new_id_strategy=new_id_strategy,
-                                              excluded_fields=[])
+                if item_settings.skip_identical and is_unchanged_copy(parent_dict[key], val, stats):
+                    continue
+                parent_dict[key] = merge_json(parent_dict[key], val, settings=item_settings, stats=stats)
             # For "only" and "only_ask", do not modify existing IDs.
         else:
             if new_id_strategy == "merge":
@@ -69,7 +110,7 @@ def merge_object_arrays(parent_list, delta_list, new_id_strategy):
             elif new_id_strategy == "only":
                 parent_dict[key] = val
             elif new_id_strategy == "only_ask":
-                answer = input(f"New ID '{key}' encountered. Add it? [y/n]: ")
+                answer = ask(f"New ID '{key}' encountered. Add it? [y/n]: ")
                 if answer.lower().startswith('y'):
                     parent_dict[key] = val
 
@@ -78,50 +119,64 @@ def merge_object_arrays(parent_list, delta_list, new_id_strategy):
 def merge_json(parent, delta,
                array_merge_strategy="merge",
                new_id_strategy="merge",
-               excluded_fields=None):
+               excluded_fields=None,
+               settings=None,
+               path=(),
+               stats=None):
     """
     Recursively merge 'delta' into 'parent'.
       - array_merge_strategy in {ignore, merge, replace}
       - new_id_strategy in {ignore, merge, only, only_ask}
       - excluded_fields is a list of field names to skip entirely
+      - settings is a precompiled MergeSettings, replacing the three options above
+      - path is the tuple of keys leading to 'parent', for path-scoped exclusions
+      - stats is an optional SkipStats counting what settings.skip_identical left alone
     """
-    if excluded_fields is None:
-        excluded_fields = []
+    if settings is None:
+        settings = MergeSettings.create(array_merge_strategy, new_id_strategy, excluded_fields)
+    array_merge_strategy = settings.array_merge_strategy
+    new_id_strategy = settings.new_id_strategy
+    skip_identical = settings.skip_identical
+    excluded_names = settings.excluded.names
+    # Scoped exclusions need the key path; skip that lookup entirely when there are none
+    is_excluded = settings.excluded.excludes if settings.excluded.has_scoped else None
 
     if isinstance(parent, dict) and isinstance(delta, dict):
         for key, value in delta.items():
             # Skip excluded fields
-            if key in excluded_fields:
+            if key in excluded_names or (is_excluded and is_excluded(key, path)):
                 continue
 
             # Special handling for ID container under key "data"
             if key == "data" and isinstance(value, dict):
+                data_path = path + (key,)
                 # If parent doesn't have "data" or it's not a dict, simply add it.
                 if key not in parent or not isinstance(parent.get(key), dict):
                     if new_id_strategy == "only_ask":
                         # For each new ID in "data", ask user individually.
                         new_data = {}
                         for subkey, subvalue in value.items():
-                            if subkey in excluded_fields:
+                            if subkey in excluded_names or (is_excluded and is_excluded(subkey, data_path)):
                                 continue
-                            answer = input(f"New ID '{subkey}' encountered in 'data'. Add it? [y/n]: ")
+                            answer = ask(f"New ID '{subkey}' encountered in 'data'. Add it? [y/n]: ")
                             if answer.lower().startswith('y'):
                                 new_data[subkey] = subvalue
                         parent[key] = new_data
                     elif new_id_strategy in ("merge", "only"):
                         # Add entire "data" as new.
-                        new_data = { sk: sv for sk, sv in value.items() if sk not in excluded_fields }
+                        new_data = { sk: sv for sk, sv in value.items()
+                                     if not (sk in excluded_names or (is_excluded and is_excluded(sk, data_path))) }
                         parent[key] = new_data
                     # For "ignore", do nothing.
                     continue
                 else:
                     # Both parent and delta have "data" as dict.
                     for subkey, subvalue in value.items():
-                        if subkey in excluded_fields:
+                        if subkey in excluded_names or (is_excluded and is_excluded(subkey, data_path)):
                             continue
                         if subkey not in parent[key]:
                             if new_id_strategy == "only_ask":
-                                answer = input(f"New ID '{subkey}' encountered in 'data'. Add it? [y/n]: ")
+                                answer = ask(f"New ID '{subkey}' encountered in 'data'. Add it? [y/n]: ")
                                 if answer.lower().startswith('y'):
                                     parent[key][subkey] = subvalue
                             elif new_id_strategy in ("merge", "only"):
@@ -129,16 +184,19 @@ def merge_json(parent, delta,
                             # For "ignore", do nothing.
                         else:
                             if new_id_strategy == "merge":
+                                # Mods often copy a vanilla ID unchanged; nothing to merge then
+                                if skip_identical and is_unchanged_copy(parent[key][subkey], subvalue, stats):
+                                    continue
                                 parent[key][subkey] = merge_json(parent[key][subkey], subvalue,
-                                                                  array_merge_strategy=array_merge_strategy,
-                                                                  new_id_strategy=new_id_strategy,
-                                                                  excluded_fields=excluded_fields)
+                                                                  settings=settings,
+                                                                  path=data_path + (subkey,),
+                                                                  stats=stats)
                             # For "only" and "only_ask", do not modify existing IDs.
                     continue
 
             if key not in parent:
                 if new_id_strategy == "only_ask":
-                    answer = input(f"New key '{key}' encountered. Add it? [y/n]: ")
+                    answer = ask(f"New key '{key}' encountered. Add it? [y/n]: ")
                     if answer.lower().startswith('y'):
                         parent[key] = value
                 elif new_id_strategy in ("merge", "only"):
@@ -149,12 +207,13 @@ def merge_json(parent, delta,
             # For keys that exist in both parent and delta (and are not the special "data" case)
             if isinstance(value, dict) and isinstance(parent.get(key), dict):
                 parent[key] = merge_json(parent[key], value,
-                                         array_merge_strategy=array_merge_strategy,
-                                         new_id_strategy=new_id_strategy,
-                                         excluded_fields=excluded_fields)
-            elif isinstance(value, list) and isinstance(parent.get(key), list):
+                                         settings=settings,
+                                         path=path + (key,),
+                                         stats=stats)
+            # compact_load stores numeric arrays as tuples; they are arrays all the same
+            elif isinstance(value, ARRAY_TYPES) and isinstance(parent.get(key), ARRAY_TYPES):
                 if len(value) > 0 and all(isinstance(item, dict) for item in value):
-                    parent[key] = merge_object_arrays(parent.get(key, []), value, new_id_strategy)
+                    parent[key] = merge_object_arrays(parent.get(key, []), value, new_id_strategy, settings, stats)
                 elif len(value) > 0 and all(isinstance(item, str) for item in value):
                     parent[key] = merge_string_arrays(parent.get(key, []), value, array_merge_strategy)
                 else:
@@ -167,15 +226,29 @@ def process_folders(folder_1, folder_2, folder_3,
                     excluded_files=None,
                     array_merge_strategy="merge",
                     new_id_strategy="merge",
-                    excluded_fields=None):
+                    excluded_fields=None,
+                    metrics=None,
+                    settings=None,
+                    compact_load=False,
+                    writer=None,
+                    skip_identical=False):
     """
     Recursively walk 'folder_1' (parent JSONs) and 'folder_2' (delta JSONs),
     merge them, and output into 'folder_3'.
+    'settings' (a MergeSettings) takes precedence over the individual options.
+    'compact_load' parses with interned keys / values to cut memory on large trees.
+    'writer' is the OutputWriter to save through; by default one is created for this call.
+    'skip_identical' leaves unchanged copies of existing IDs alone (see is_unchanged_copy);
+    a summary of what was skipped is printed at the end.
     """
+    if metrics is None:
+        metrics = Metrics("merge_json")
     if excluded_files is None:
         excluded_files = []
-    if excluded_fields is None:
-        excluded_fields = []
+    if settings is None:
+        settings = MergeSettings.create(array_merge_strategy, new_id_strategy, excluded_fields, skip_identical)
+    load = json_loader(compact_load)
+    stats = SkipStats() if settings.skip_identical else None
 
     folder_1_path = Path(folder_1)
     folder_2_path = Path(folder_2)
@@ -183,44 +256,65 @@ def process_folders(folder_1, folder_2, folder_3,
 
     folder_3_path.mkdir(parents=True, exist_ok=True)
 
-    # Traverse folder_1
-    for root, _, files in os.walk(folder_1_path):
-        # Calculate relative path to replicate structure in folder_3
-        relative = Path(root).relative_to(folder_1_path)
-        target_dir = folder_3_path / relative
-        target_dir.mkdir(parents=True, exist_ok=True)
+    with output_writer(writer) as writer:
+        # Traverse folder_1
+        for root, _, files in os.walk(folder_1_path):
+            # Calculate relative path to replicate structure in folder_3
+            relative = Path(root).relative_to(folder_1_path)
+            target_dir = folder_3_path / relative
+            target_dir.mkdir(parents=True, exist_ok=True)
 
-        for file_name in files:
-            if file_name in excluded_files:
-                continue
+            for file_name in files:
+                if file_name in excluded_files:
+                    continue
 
-            source_1 = folder_1_path / relative / file_name
-            source_2 = folder_2_path / relative / file_name
-            dest_3 = target_dir / file_name
+                source_1 = folder_1_path / relative / file_name
+                source_2 = folder_2_path / relative / file_name
+                dest_3 = target_dir / file_name
 
-            # Only merge if JSON
-            if source_1.suffix.lower() == ".json":
-                parent_data = load_json(source_1)
-                delta_data = load_json(source_2) if source_2.exists() else None
+                merge_file(source_1, source_2, dest_3, settings, metrics, load=load, writer=writer, stats=stats)
 
-                if parent_data is None:
-                    shutil.copy(source_1, dest_3)
-                    continue
+    if stats is not None:
+        print(stats.summary())
 
-                if delta_data is not None:
-                    merged = merge_json(
-                        parent_data,
-                        delta_data,
-                        array_merge_strategy=array_merge_strategy,
-                        new_id_strategy=new_id_strategy,
-                        excluded_fields=excluded_fields
-                    )
-                    save_json(merged, dest_3)
-                else:
-                    save_json(parent_data, dest_3)
+def json_loader(compact_load):
+    """load_json, or a variant sharing one CompactLoader across all files of the run."""
+    if compact_load:
+        return partial(load_json, loader=CompactLoader())
+    return load_json
+
+def merge_file(source_1, source_2, dest_3, settings, metrics, load=load_json, writer=None, stats=None):
+    """
+    Merge one parent file with its delta (if any) into dest_3; non-JSON files are copied.
+    'load' lets callers such as watch mode serve already parsed files.
+    """
+    # Only merge if JSON
+    if source_1.suffix.lower() == ".json":
+        with metrics.file(source_1) as fm:
+            with fm.phase("parse"):
+                parent_data = load(source_1)
+                delta_data = load(source_2) if source_2.exists() else None
+            fm.track_read(source_1)
+            fm.track_read(source_2)
+
+            if parent_data is None:
+                copy_atomic(source_1, dest_3, metadata=False)
+                return
+
+            if delta_data is not None:
+                fm.count_nodes(parent_data)
+                fm.count_nodes(delta_data)
+                with fm.phase("transform"):
+                    merged = merge_json(parent_data, delta_data, settings=settings, stats=stats)
+                with fm.phase("write"):
+                    size = save_json(merged, dest_3, writer)
             else:
-                if source_1.is_file():
-                    shutil.copy2(source_1, dest_3)
+                with fm.phase("write"):
+                    size = save_json(parent_data, dest_3, writer)
+            fm.track_write(dest_3, size)
+    else:
+        if source_1.is_file():
+            copy_atomic(source_1, dest_3)
 
 def main():
     # Example usage:
@@ -229,33 +323,28 @@ def main():
     # Get the script name without the .py extension
     script_name = os.path.splitext(os.path.basename(__file__))[0]
 
-    # Define the path to config.json relative to the script's location
-    config_path = os.path.join('..', 'scripts_config.json')  # Adjust the path as needed
-
-    if not os.path.exists(config_path):
-        print(f"Configuration file not found at {config_path}")
-        sys.exit(1)
-
-    with open(config_path, 'r', encoding='utf-8') as config_file:
-        config = json.load(config_file)
-
-    script_config = config.get(script_name)
-    if script_config is None:
-        print(f"No configuration found for script: {script_name}")
+    # Load and validate ../scripts_config.json once, excluded fields compiled to sets
+    try:
+        config = load_config()
+        script_config = script_section(config, script_name)
+        settings = MergeSettings.from_section(script_config)
+        writer = OutputWriter.from_config(config)
+        metrics = Metrics.from_config(script_name, config)
+    except ConfigError as e:
+        print(e)
         sys.exit(1)
 
-    for key, value in script_config.items():
-        globals()[key] = value
-
-    process_folders(
-        input_folder,
-        change_folder,
-        output_folder,
-        excluded_files=None,
-        array_merge_strategy=array_merge_strategy,
-        new_id_strategy=new_id_strategy,
-        excluded_fields=excluded_fields
-    )
+    with metrics.run(), writer:
+        process_folders(
+            script_config["input_folder"],
+            script_config["change_folder"],
+            script_config["output_folder"],
+            excluded_files=None,
+            metrics=metrics,
+            settings=settings,
+            compact_load=script_config["compact_load"],
+            writer=writer
+        )
     print("Done merging.")
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
+import io
 import os
 import json5 as json
 import sys
 import traceback
+from config_loader import ConfigError, load_config, script_section
+from instrumentation import Metrics
+from atomic_writer import OutputWriter, output_writer
 
 def load_json(filepath):
     """Load JSON data from a file."""
@@ -19,132 +23,150 @@ def get_full_item_objects(data, id_key, added_items):
     # Filter items where 'item' is in added_items
     return [item for item in items if item.get("item") in added_items]
 
+def compare_ids(json1, json2):
+    """Find IDs and IDDs present in json2 but not in json1, with their full objects."""
+    data1 = json1.get("data", {})
+    data2 = json2.get("data", {})
+
+    # Initialize reports
+    extra_ids = set(data2.keys()) - set(data1.keys())
+    common_ids = set(data2.keys()).intersection(set(data1.keys()))
+    idd_report = {}
+    extra_ids_full = {}
+    idd_full_objects = {}
+
+    # Collect Extra Top-Level IDs and their full objects
+    if extra_ids:
+        extra_ids_full = {id_key: data2[id_key] for id_key in extra_ids}
+
+    # For IDs present in both, check for extra IDDs
+    for id_key in common_ids:
+        items2 = get_item_set(data2, id_key)
+        items1 = get_item_set(data1, id_key)
+        added_items = items2 - items1
+        if added_items:
+            # Retrieve full item objects for added IDDs
+            added_item_objects = get_full_item_objects(data2, id_key, added_items)
+            idd_report[id_key] = sorted(added_items)
+            idd_full_objects[id_key] = added_item_objects
+    return extra_ids, idd_report, extra_ids_full, idd_full_objects
+
+def write_report(txt_path, extra_ids, idd_report, extra_ids_full, idd_full_objects, writer=None):
+    """Write the new ID report for one file (through `writer`, an OutputWriter, if given). Returns its size."""
+    with io.StringIO() as txt_file:
+        # 1. List of Added Top-Level IDs
+        if extra_ids:
+            txt_file.write("=== List of Added Top-Level IDs ===\n")
+            for extra_id in sorted(extra_ids):
+                txt_file.write(f"- {extra_id}\n")
+            txt_file.write("\n")
+
+        # 2. List of Added IDDs Under Existing IDs
+        if idd_report:
+            txt_file.write("=== List of Added IDDs Under Existing IDs ===\n")
+            for id_key in sorted(idd_report.keys()):
+                txt_file.write(f"ID: {id_key}\n")
+                for added_idd in idd_report[id_key]:
+                    txt_file.write(f"  - {added_idd}\n")
+            txt_file.write("\n")
+
+        # 3. Full Objects of Added Top-Level IDs (Desired Pattern)
+        if extra_ids_full:
+            txt_file.write("=== Full Objects of Added Top-Level IDs ===\n")
+            top_level_blocks = []
+            for extra_id, obj in sorted(extra_ids_full.items()):
+                obj_pretty = json.dumps(obj, indent=4, ensure_ascii=False, quote_keys=True)
+                # Indent the JSON block by 4 spaces
+                indented_obj = '    ' + obj_pretty.replace('\n', '\n    ')
+                block = f'"{extra_id}":\n{indented_obj}'
+                top_level_blocks.append(block)
+            # Join each block with a comma and newline between them
+            txt_file.write((",\n").join(top_level_blocks))
+            txt_file.write("\n\n")
+
+        # 4. Full Objects of Added IDDs (Desired Pattern)
+        if idd_full_objects:
+            txt_file.write("=== Full Objects of Added IDDs ===\n")
+            for id_key, items in sorted(idd_full_objects.items()):
+                txt_file.write(f'"{id_key}":\n')
+                item_blocks = []
+                for item in items:
+                    item_pretty = json.dumps(item, indent=4, ensure_ascii=False, quote_keys=True)
+                    # Indent each item by 2 spaces
+                    indented_item = '  ' + item_pretty.replace('\n', '\n  ')
+                    item_blocks.append(indented_item)
+                # Join item blocks with a comma and newline between them,
+                # then add a trailing comma after the group
+                txt_file.write((",\n").join(item_blocks))
+                txt_file.write(",\n")
+
+        with output_writer(writer) as out:
+            return out.write_text(txt_path, txt_file.getvalue())
+
+def process_folders(input_folder, change_folder, output_folder, metrics=None, writer=None):
+    """Report new IDs and IDDs for every JSON file present in both folders."""
+    if metrics is None:
+        metrics = Metrics("report_new_id")
+    with output_writer(writer) as writer:
+        # List all JSON files in input_folder
+        for filename in os.listdir(input_folder):
+            if not filename.endswith('.json'):
+                continue  # Skip non-JSON files
+
+            path1 = os.path.join(input_folder, filename)
+            path2 = os.path.join(change_folder, filename)
+
+            # Check if corresponding file exists in change_folder
+            if not os.path.exists(path2):
+                print(f"Skipping {filename}: not found in folder '{change_folder}'.")
+                continue
+
+            with metrics.file(path1) as fm:
+                try:
+                    with fm.phase("parse"):
+                        json1 = load_json(path1)
+                        json2 = load_json(path2)
+                except json.JSONDecodeError as e:
+                    print(f"Error decoding JSON for file {filename}: {e}")
+                    continue
+                fm.track_read(path1)
+                fm.track_read(path2)
+                fm.count_nodes(json1)
+                fm.count_nodes(json2)
+
+                with fm.phase("transform"):
+                    extra_ids, idd_report, extra_ids_full, idd_full_objects = compare_ids(json1, json2)
+
+                # Check if there are any changes
+                if extra_ids or idd_report:
+                    # Prepare the .txt filename
+                    txt_filename = os.path.splitext(filename)[0] + '.txt'
+                    txt_path = os.path.join(output_folder, txt_filename)
+
+                    with fm.phase("write"):
+                        size = write_report(txt_path, extra_ids, idd_report, extra_ids_full, idd_full_objects, writer)
+                    fm.track_write(txt_path, size)
+                    print(f"Changes found in '{filename}'. Report saved to '{txt_path}'.")
+                else:
+                    print(f"No changes found in '{filename}'.")
+
 def main():
     # Get the script name without the .py extension
     script_name = os.path.splitext(os.path.basename(__file__))[0]
     
-    # Define the path to config.json relative to the script's location
-    config_path = os.path.join('..', 'scripts_config.json')  # Adjust the path as needed
-    
-    # Check if config.json exists
-    if not os.path.exists(config_path):
-        print(f"Configuration file not found at {config_path}")
-        sys.exit(1)
-    
-    # Load the JSON configuration
-    with open(config_path, 'r') as config_file:
-        config = json.load(config_file)
-    
-    # Retrieve the configuration for the current script
-    script_config = config.get(script_name)
-    if script_config is None:
-        print(f"No configuration found for script: {script_name}")
+    # Load ../scripts_config.json and validate this script's section
+    try:
+        config = load_config()
+        script_config = script_section(config, script_name)
+        writer = OutputWriter.from_config(config)
+        metrics = Metrics.from_config(script_name, config)
+    except ConfigError as e:
+        print(e)
         sys.exit(1)
-    
-    # Dynamically assign configuration parameters as variables
-    for key, value in script_config.items():
-        globals()[key] = value
-
-    # List all JSON files in input_folder
-    for filename in os.listdir(input_folder):
-        if not filename.endswith('.json'):
-            continue  # Skip non-JSON files
-
-        path1 = os.path.join(input_folder, filename)
-        path2 = os.path.join(change_folder, filename)
-
-        # Check if corresponding file exists in change_folder
-        if not os.path.exists(path2):
-            print(f"Skipping {filename}: not found in folder '{change_folder}'.")
-            continue
-
-        try:
-            json1 = load_json(path1)
-            json2 = load_json(path2)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON for file {filename}: {e}")
-            continue
-
-        data1 = json1.get("data", {})
-        data2 = json2.get("data", {})
-
-        # Initialize reports
-        extra_ids = set(data2.keys()) - set(data1.keys())
-        common_ids = set(data2.keys()).intersection(set(data1.keys()))
-        idd_report = {}
-        extra_ids_full = {}
-        idd_full_objects = {}
-
-        # Collect Extra Top-Level IDs and their full objects
-        if extra_ids:
-            extra_ids_full = {id_key: data2[id_key] for id_key in extra_ids}
-
-        # For IDs present in both, check for extra IDDs
-        for id_key in common_ids:
-            items2 = get_item_set(data2, id_key)
-            items1 = get_item_set(data1, id_key)
-            added_items = items2 - items1
-            if added_items:
-                # Retrieve full item objects for added IDDs
-                added_item_objects = get_full_item_objects(data2, id_key, added_items)
-                idd_report[id_key] = sorted(added_items)
-                idd_full_objects[id_key] = added_item_objects
-
-        # Check if there are any changes
-        if extra_ids or idd_report:
-            # Prepare the .txt filename
-            txt_filename = os.path.splitext(filename)[0] + '.txt'
-            txt_path = os.path.join(output_folder, txt_filename)
-
-            with open(txt_path, 'w', encoding='utf-8') as txt_file:
-                # 1. List of Added Top-Level IDs
-                if extra_ids:
-                    txt_file.write("=== List of Added Top-Level IDs ===\n")
-                    for extra_id in sorted(extra_ids):
-                        txt_file.write(f"- {extra_id}\n")
-                    txt_file.write("\n")
-
-                # 2. List of Added IDDs Under Existing IDs
-                if idd_report:
-                    txt_file.write("=== List of Added IDDs Under Existing IDs ===\n")
-                    for id_key in sorted(idd_report.keys()):
-                        txt_file.write(f"ID: {id_key}\n")
-                        for added_idd in idd_report[id_key]:
-                            txt_file.write(f"  - {added_idd}\n")
-                    txt_file.write("\n")
-
-                # 3. Full Objects of Added Top-Level IDs (Desired Pattern)
-                if extra_ids_full:
-                    txt_file.write("=== Full Objects of Added Top-Level IDs ===\n")
-                    top_level_blocks = []
-                    for extra_id, obj in sorted(extra_ids_full.items()):
-                        obj_pretty = json.dumps(obj, indent=4, ensure_ascii=False, quote_keys=True)
-                        # Indent the JSON block by 4 spaces
-                        indented_obj = '    ' + obj_pretty.replace('\n', '\n    ')
-                        block = f'"{extra_id}":\n{indented_obj}'
-                        top_level_blocks.append(block)
-                    # Join each block with a comma and newline between them
-                    txt_file.write((",\n").join(top_level_blocks))
-                    txt_file.write("\n\n")
-
-                # 4. Full Objects of Added IDDs (Desired Pattern)
-                if idd_full_objects:
-                    txt_file.write("=== Full Objects of Added IDDs ===\n")
-                    for id_key, items in sorted(idd_full_objects.items()):
-                        txt_file.write(f'"{id_key}":\n')
-                        item_blocks = []
-                        for item in items:
-                            item_pretty = json.dumps(item, indent=4, ensure_ascii=False, quote_keys=True)
-                            # Indent each item by 2 spaces
-                            indented_item = '  ' + item_pretty.replace('\n', '\n  ')
-                            item_blocks.append(indented_item)
-                        # Join item blocks with a comma and newline between them,
-                        # then add a trailing comma after the group
-                        txt_file.write((",\n").join(item_blocks))
-                        txt_file.write(",\n")
-            print(f"Changes found in '{filename}'. Report saved to '{txt_path}'.")
-        else:
-            print(f"No changes found in '{filename}'.")
+
+    with metrics.run(), writer:
+        process_folders(script_config['input_folder'], script_config['change_folder'],
+                        script_config['output_folder'], metrics, writer)
 
 if __name__ == "__main__":
     try:
@@ -1,5 +1,10 @@
 import os
 import re
+import sys
+from collections import Counter
+from config_loader import CONFIG_PATH, ConfigError, load_config, script_section
+from instrumentation import Metrics
+from async_pipeline import Progress, run_pipeline
 
 mapping = {
     "fcount": "f",
@@ -18,15 +23,54 @@ def shorten_tokens(name):
         return mapping[token] + number
     return re.sub(pattern, repl, name)
 
+def rename_file(folder, filename, new_filename, metrics):
+    with metrics.file(filename) as fm:
+        with fm.phase("write"):
+            os.rename(os.path.join(folder, filename), os.path.join(folder, new_filename))
+
+def rename_textures(folder='.', concurrency=1, metrics=None):
+    """Rename old-format *.png files in `folder`, up to `concurrency` at a time."""
+    if metrics is None:
+        metrics = Metrics("texture_renamer")
+    with os.scandir(folder) as entries:
+        filenames = [entry.name for entry in entries if entry.name.endswith('.png') and entry.is_file()]
+
+    renames = []
+    for filename in filenames:
+        base, ext = os.path.splitext(filename)
+        new_filename = shorten_tokens(base) + ext
+        if new_filename != filename:
+            renames.append((filename, new_filename))
+
+    # A rename onto an existing name or onto another rename's target depends on order: keep those sequential
+    existing = set(filenames)
+    target_counts = Counter(new_filename for _, new_filename in renames)
+    independent = [(old, new) for old, new in renames if new not in existing and target_counts[new] == 1]
+    ordered = [(old, new) for old, new in renames if new in existing or target_counts[new] > 1]
+
+    progress = Progress(len(renames), "files renamed")
+    if concurrency > 1:
+        run_pipeline(independent, lambda job: rename_file(folder, job[0], job[1], metrics), concurrency, progress)
+    else:
+        ordered = renames
+    for filename, new_filename in ordered:
+        progress.advance(rename_file(folder, filename, new_filename, metrics))
+    print(f"{len(filenames) - len(renames)} of {len(filenames)} textures already had new names. {progress.summary()}")
+
 def main():
-    for filename in os.listdir('.'):
-        if os.path.isfile(filename) and filename.endswith('.png'):
-            base, ext = os.path.splitext(filename)
-            new_base = shorten_tokens(base)
-            new_filename = new_base + ext
-            if new_filename != filename:
-                print(f"Renaming '{filename}' to '{new_filename}'")
-                os.rename(filename, new_filename)
+    # Usually copied into a texture folder with no config next to it: defaults then (metrics via ZS_METRICS=1)
+    config = None
+    try:
+        if os.path.exists(CONFIG_PATH):
+            config = load_config()
+        script_config = script_section(config or {}, "texture_renamer", required=False)
+        metrics = Metrics.from_config("texture_renamer", config)
+    except ConfigError as e:
+        print(e)
+        sys.exit(1)
+
+    with metrics.run():
+        rename_textures('.', script_config['concurrency'], metrics)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,288 @@
+"""
+Watch mode for merge_json.
+
+Merges everything once, then watches the merge_json input_folder and
+change_folder and re-merges only the relative paths touched by each burst of
+saves. Uses inotify on Linux and falls back to polling file mtimes elsewhere
+(e.g. Windows). Parsed files are kept in memory between events, so a save in
+change/ only re-parses that one file.
+
+Settings: folders and strategies from the "merge_json" config section,
+timings from "watch_merge". new_id_strategy "only_ask" would stop every
+re-merge on a prompt, so it is treated as "only". Stop with Ctrl+C.
+"""
+import copy
+import dataclasses
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from config_loader import ConfigError, MergeSettings, load_config, script_section
+from instrumentation import Metrics
+from merge_json import json_loader, merge_file
+from atomic_writer import OutputWriter
+
+# inotify event masks, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) snapshots of the watched folders."""
+
+    def __init__(self, roots, poll_interval):
+        self.roots = roots
+        self.poll_interval = poll_interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for root in self.roots:
+            for folder, _, files in os.walk(root):
+                for filename in files:
+                    path = os.path.join(folder, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        """Block up to `timeout` seconds (None = forever); return the set of changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over whole folder trees, via ctypes (no extra dependency)."""
+
+    def __init__(self, roots):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for root in roots:
+            for folder, _, _ in os.walk(root):
+                self._add_watch(folder)
+
+    def _add_watch(self, folder):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = folder
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, name_length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; report every known folder so everything is re-checked
+                changed.update(self.dirs.values())
+                continue
+            folder = self.dirs.get(wd)
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_watch(path)
+                    changed.add(path)
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(roots, poll_interval):
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}), falling back to polling.")
+    return PollingWatcher(roots, poll_interval)
+
+
+class ParsedCache:
+    """Parsed JSON files kept between events, invalidated by mtime and size."""
+
+    def __init__(self, load):
+        self.load_uncached = load
+        self.entries = {}
+
+    def load(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.entries.pop(str(path), None)
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self.entries.get(str(path))
+        if cached is not None and cached[0] == key:
+            data = cached[1]
+        else:
+            data = self.load_uncached(path)
+            if data is None:
+                return None
+            self.entries[str(path)] = (key, data)
+        # merge_json merges into the parent in place, so hand out a copy
+        return copy.deepcopy(data)
+
+
+def wait_for_burst(watcher, debounce):
+    """Wait for the first change, then keep collecting until `debounce` seconds pass quietly."""
+    changed = watcher.wait(None)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def affected_files(changed, roots):
+    """Map changed absolute paths to relative paths under either watched root."""
+    relative = set()
+    for path in changed:
+        path = os.path.abspath(path)
+        for root in roots:
+            if path == root or path.startswith(root + os.sep):
+                # A root itself (after an inotify overflow) maps to "." = everything
+                relative.add(Path(os.path.relpath(path, root)))
+    return relative
+
+
+def unattended_settings(settings):
+    """Settings that never prompt: "only_ask" becomes "only", with a notice."""
+    if settings.new_id_strategy != "only_ask":
+        return settings
+    print('Watch mode cannot ask about new IDs on every save: new_id_strategy "only_ask" is used as "only".')
+    return dataclasses.replace(settings, new_id_strategy="only")
+
+
+def watch(input_folder, change_folder, output_folder, settings,
+          debounce=0.2, poll_interval=0.5, metrics=None, compact_load=False, writer=None):
+    if metrics is None:
+        metrics = Metrics("watch_merge")
+    settings = unattended_settings(settings)
+    input_path = Path(input_folder)
+    change_path = Path(change_folder)
+    output_path = Path(output_folder)
+    cache = ParsedCache(json_loader(compact_load))
+    own_writer = writer is None
+    if own_writer:
+        writer = OutputWriter()
+
+    def merge_relative(relative):
+        source_1 = input_path / relative
+        if not source_1.is_file():
+            return False
+        dest_3 = output_path / relative
+        dest_3.parent.mkdir(parents=True, exist_ok=True)
+        merge_file(source_1, change_path / relative, dest_3, settings, metrics, load=cache.load, writer=writer)
+        return True
+
+    # Initial full merge primes the cache
+    start = time.perf_counter()
+    count = 0
+    for root, _, files in os.walk(input_path):
+        for file_name in files:
+            count += merge_relative((Path(root) / file_name).relative_to(input_path))
+    writer.flush()
+    print(f"Merged {count} files in {time.perf_counter() - start:.2f}s. Watching for changes (Ctrl+C to stop)...")
+
+    roots = [os.path.abspath(input_folder), os.path.abspath(change_folder)]
+    watcher = create_watcher(roots, poll_interval)
+    try:
+        while True:
+            changed = wait_for_burst(watcher, debounce)
+            start = time.perf_counter()
+            to_merge = set()
+            for relative in affected_files(changed, roots):
+                if (input_path / relative).is_dir() or (change_path / relative).is_dir():
+                    # New or moved folder: merge whatever it contains
+                    for root, _, files in os.walk(input_path / relative):
+                        for file_name in files:
+                            to_merge.add((Path(root) / file_name).relative_to(input_path))
+                else:
+                    to_merge.add(relative)
+            merged = [relative for relative in sorted(to_merge) if merge_relative(relative)]
+            writer.flush()
+            if merged:
+                names = ", ".join(str(relative) for relative in merged)
+                print(f"Re-merged {names} in {(time.perf_counter() - start) * 1000:.0f} ms.")
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    finally:
+        watcher.close()
+        if own_writer:
+            writer.close()
+
+
+def main():
+    try:
+        config = load_config()
+        merge_config = script_section(config, "merge_json")
+        watch_config = script_section(config, "watch_merge", required=False)
+        settings = MergeSettings.from_section(merge_config)
+        writer = OutputWriter.from_config(config)
+        metrics = Metrics.from_config("watch_merge", config)
+    except ConfigError as e:
+        print(e)
+        sys.exit(1)
+
+    with metrics.run(), writer:
+        watch(merge_config["input_folder"], merge_config["change_folder"], merge_config["output_folder"],
+              settings,
+              debounce=watch_config["debounce_ms"] / 1000,
+              poll_interval=watch_config["poll_interval_ms"] / 1000,
+              metrics=metrics,
+              compact_load=merge_config["compact_load"],
+              writer=writer)
+
+if __name__ == "__main__":
+    try:
+        main()
+        print("Script finished successfully.")
+    except Exception as e:
+        error_message = traceback.format_exc()
+        print("An error occurred:\n", error_message)
+    finally:
+        input("\nPress Enter to exit...")
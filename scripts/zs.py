@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+zs - single entry point for all scripts.
+
+    zs <command> [args] [--no-pause]
+    zs --list
+
+Only the module of the chosen command is imported, so one zs.exe can replace
+the per-script executables and a launch loads nothing the command doesn't use.
+Script names (merge_json, report_new_id, ...) are accepted as aliases so
+run.exe can launch `zs.exe <config section>`.
+"""
+import os
+import sys
+
+# command -> (module, description)
+COMMANDS = {
+    "merge": ("merge_json", "Merge input JSON files with change files into output"),
+    "report": ("report_new_id", "Report new IDs / IDDs added by change files"),
+    "watch": ("watch_merge", "Merge, then re-merge changed files on every save"),
+    "sort": ("alphabetic_sort", "Sort JSON files alphabetically"),
+    "fix": ("fix_trailing_comma", "Remove trailing commas from JSON files"),
+    "edit": ("field_editor", "Add to / multiply a numeric field in all items"),
+    "rename": ("texture_renamer", "Rename old-format texture files in the current folder"),
+    "index": ("id_index", "Index item IDs; index query ID / index dangling"),
+    "gui": ("run", "Open the config editor GUI"),
+}
+ALIASES = {module: command for command, (module, _) in COMMANDS.items()}
+
+
+def load_command(command):
+    """Import the module behind a command and return its main().
+
+    Imports are spelled out so PyInstaller can find them, but each one only
+    runs when its command is chosen.
+    """
+    if command == "merge":
+        import merge_json
+        return merge_json.main
+    if command == "report":
+        import report_new_id
+        return report_new_id.main
+    if command == "watch":
+        import watch_merge
+        return watch_merge.main
+    if command == "sort":
+        import alphabetic_sort
+        return alphabetic_sort.main
+    if command == "fix":
+        import fix_trailing_comma
+        return fix_trailing_comma.main
+    if command == "edit":
+        import field_editor
+        return field_editor.main
+    if command == "rename":
+        import texture_renamer
+        return texture_renamer.main
+    if command == "index":
+        import id_index
+        return id_index.main
+    if command == "gui":
+        # run.py lives next to the scripts folder and expects that as working directory
+        os.chdir("..")
+        sys.path.insert(0, os.getcwd())
+        import run
+        return run.main
+    raise KeyError(command)
+
+
+def print_usage():
+    print("Usage: zs <command> [args] [--no-pause]\n\nCommands:")
+    for command, (module, description) in COMMANDS.items():
+        print(f"  {command:<8} {description} ({module})")
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    pause = "--no-pause" not in args
+    args = [arg for arg in args if arg != "--no-pause"]
+
+    if not args or args[0] in ("-h", "--help", "--list"):
+        print_usage()
+        # A double-clicked zs.exe has no arguments; keep its window open like the other exes
+        if pause:
+            input("\nPress Enter to exit...")
+        return 0
+
+    command = ALIASES.get(args[0], args[0])
+    if command not in COMMANDS:
+        print(f"Unknown command: {args[0]}")
+        print_usage()
+        if pause:
+            input("\nPress Enter to exit...")
+        return 2
+    # Scripts take their settings from scripts_config.json, not argv
+    sys.argv = [COMMANDS[command][0]] + args[1:]
+
+    if command == "gui":
+        load_command(command)()
+        return 0
+
+    import traceback
+    status = 0
+    try:
+        load_command(command)()
+        print("Script finished successfully.")
+    except Exception:
+        error_message = traceback.format_exc()
+        print("An error occurred:\n", error_message)
+        status = 1
+    finally:
+        if pause:
+            input("\nPress Enter to exit...")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())